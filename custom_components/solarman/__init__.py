@@ -8,6 +8,7 @@ from homeassistant import loader
 from homeassistant.const import Platform
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers import config_validation, discovery_flow
 from homeassistant.helpers.entity_registry import RegistryEntry, async_get, async_migrate_entries
@@ -19,6 +20,7 @@ from .common import *
 from .services import register
 from .discovery import discover
 from .coordinator import Coordinator
+from .provider import ConfigurationProvider
 from .config_flow import ConfigFlowHandler
 
 _LOGGER = getLogger(__name__)
@@ -63,6 +65,8 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry[Coord
 
     @callback
     def migrate(entity_entry: RegistryEntry):
+        if any(entity_entry.unique_id.startswith(f"{subdevice.id}_") for subdevice in config_entry.runtime_data.device.subdevices):
+            return None
         if entity_entry.unique_id != (unique_id := slugify(config_entry.entry_id, entity_entry.original_name if entity_entry.has_entity_name or not entity_entry.original_name else entity_entry.original_name.replace(config_entry.title, '').strip(), split_entity_id(entity_entry.entity_id)[0])):
             if conflict_entity_id := async_get(hass).async_get_entity_id(entity_entry.domain, entity_entry.platform, unique_id):
                 _LOGGER.debug(f"Unique id '{unique_id}' is already in use by '{conflict_entity_id}'")
@@ -100,6 +104,19 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry[Coor
 
     return await hass.config_entries.async_unload_platforms(config_entry, _PLATFORMS)
 
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry[Coordinator]):
+    _LOGGER.debug(f"async_remove_entry({config_entry.as_dict()})")
+
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}").async_remove()
+
+    try:
+        slaves = ConfigurationProvider(hass, config_entry).slaves
+    except ValueError:
+        slaves = []
+
+    for slave, _ in slaves:
+        await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{slugify(config_entry.entry_id, str(slave))}").async_remove()
+
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry[Coordinator]):
     _LOGGER.debug(f"async_migrate_entry({config_entry.as_dict()})")
     _LOGGER.info("Migrating configuration version %s.%s to %s.%s", config_entry.version, config_entry.minor_version, ConfigFlowHandler.VERSION, ConfigFlowHandler.MINOR_VERSION)
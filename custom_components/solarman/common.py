@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import os
 import ast
 import time
 import yaml
+import pickle
 import socket
 import asyncio
 import aiofiles
 import voluptuous as vol
 
+from array import array
 from pathlib import Path
 from functools import wraps
 from aiohttp import FormData
@@ -21,6 +24,11 @@ from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, Device
 
 from .const import *
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 _LOGGER = getLogger(__name__)
 
 def retry(ignore: tuple = ()):
@@ -83,6 +91,16 @@ def get_current_file_name(value):
 async def async_listdir(path, prefix = "", extensions = ("yaml", "yml")):
     return sorted([prefix + f.name for f in await async_execute(lambda: p.glob('*')) if f.is_file() and f.name.endswith(extensions)]) if (p := Path(path)) and p.exists() else []
 
+def parse_slaves(value: str) -> list[tuple[int, str]]:
+    # Additional slaves on the same bus are declared as "slave[:profile]" items separated by commas, w/o profile it's autodetected
+    slaves = []
+    for item in filter(None, (i.strip() for i in value.split(","))):
+        slave, _, filename = item.partition(":")
+        if not (slave := slave.strip()).isdigit() or not 0 < (slave := int(slave)) < 248:
+            raise ValueError(f"Invalid Modbus Slave ID in '{item}'")
+        slaves.append((slave, filename.strip() or DEFAULT_[CONF_LOOKUP_FILE]))
+    return slaves
+
 def getipaddress(address: str):
     try:
         return IPv4Address(address)
@@ -158,7 +176,31 @@ def process_profile(filename, parameters):
 
 async def yaml_open(file):
     async with aiofiles.open(file) as f:
-        return yaml.safe_load(await f.read())
+        return yaml.load(await f.read(), Loader = YamlLoader)
+
+def file_stamp(file):
+    return (s := os.stat(file)).st_mtime_ns, s.st_size
+
+async def pickle_open(file):
+    try:
+        async with aiofiles.open(file, "rb") as f:
+            return pickle.loads(await f.read())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        _LOGGER.debug(f"Error reading {file}: {strepr(e)}")
+        return None
+
+async def pickle_save(file, data):
+    def save():
+        os.makedirs(os.path.dirname(file), exist_ok = True)
+        with open(temp := f"{file}.tmp", "wb") as f:
+            pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, file)
+    try:
+        await async_execute(save)
+    except Exception as e:
+        _LOGGER.debug(f"Error writing {file}: {strepr(e)}")
 
 def build_configuration_url(host: str):
     return f"http://{host}/config_hide.html"
@@ -271,42 +313,51 @@ def preprocess_descriptions(item, group, table, code, parameters):
 
     return item
 
-def postprocess_descriptions(coordinator):
+def postprocess_descriptions(parser, data: dict):
     def not_enabled(description):
-        return (l := description.get("enabled_lookup")) is not None and (k := list(l)[0]) is not None and (v := coordinator.data.get(k)) is not None and not get_tuple(v) in l[k]
+        return (l := description.get("enabled_lookup")) is not None and (k := list(l)[0]) is not None and (v := data.get(k)) is not None and not get_tuple(v) in l[k]
 
-    descriptions = coordinator.device.profile.parser.get_entity_descriptions()
+    descriptions = parser.get_entity_descriptions()
 
     for description in descriptions:
         if not_enabled(description):
             continue
 
-        if (nlookup := description.get("name_lookup")) is not None and (prefix := coordinator.data.get(nlookup)) is not None:
+        # Profile items are shared by all the entries w/ the same profile, so they are modified only as own copies
+        if (nlookup := description.get("name_lookup")) is not None and (prefix := data.get(nlookup)) is not None:
+            description = parser.own(description)
             description["name"] = replace_first(description["name"], get_tuple(prefix))
             description["key"] = entity_key(description)
 
-        if (sensors := description.get("sensors")) is not None:
+        if (sensors := description.get("sensors")) is not None and any(not_enabled(sensor) for sensor in sensors):
+            sensors = (description := parser.own(description))["sensors"]
             for sensor in list(sensors):
                 if not_enabled(sensor):
                     sensors.remove(sensor)
 
         if validation := description.get("validation"):
-            if (vlookup := validation.get("lookup")) and (max_value := coordinator.data.get(vlookup)) is not None and (value := abs(get_tuple(max_value))):
-                if "min" not in validation:
-                    validation["min"] = -value
-                if "max" not in validation:
-                    validation["max"] = value
-            if s := validation.get("scale"):
-                if "min" in validation:
-                    validation["min"] *= s
-                if "max" in validation:
-                    validation["max"] *= s
+            value = abs(get_tuple(max_value)) if (vlookup := validation.get("lookup")) and (max_value := data.get(vlookup)) is not None else None
+            if value or validation.get("scale"):
+                validation = (description := parser.own(description))["validation"]
+                if value:
+                    if "min" not in validation:
+                        validation["min"] = -value
+                    if "max" not in validation:
+                        validation["max"] = value
+                if s := validation.get("scale"):
+                    if "min" in validation:
+                        validation["min"] *= s
+                    if "max" in validation:
+                        validation["max"] *= s
 
         # Temporary location of fix for latest HA changes regarding default precision behavior
         if description["platform"] == "sensor" and description.get('suggested_display_precision') is None and (description.get("class") or description.get("device_class")) in ("energy", "energy_storage") and (description.get("suggested_unit_of_measurement") or description.get("unit_of_measurement") or description.get("uom")) == "kWh":
+            description = parser.own(description)
             description["suggested_display_precision"] = 1
 
-    _LOGGER.debug(f"postprocess_descriptions: {descriptions}")
+    parser.compile()
+
+    _LOGGER.debug(f"postprocess_descriptions: {parser.get_entity_descriptions()}")
 
 def get_code(item, type, default = None):
     if REQUEST_CODE in item and (code := item[REQUEST_CODE]):
@@ -317,16 +368,34 @@ def get_code(item, type, default = None):
             return code[type]
     return default
 
-def get_start_addr(data, code, addr):
-    for d in data:
-        if d[0] == code and d[1] <= addr < d[1] + len(data[d]):
-            return d
-    return None
-
-def get_addr_value(data, code, addr):
-    if (start := get_start_addr(data, code, addr)) is None:
-        return None
-    return data[start][addr - start[1]]
+class RegisterImage(dict[tuple[int, int], array | list[int]]):
+    def __init__(self):
+        super().__init__()
+        self._words: dict[int, array] = {}
+        self._present: dict[int, bytearray] = {}
+
+    def __setitem__(self, key: tuple[int, int], value: array | list[int]):
+        super().__setitem__(key, value)
+        code, address = key
+        if (words := self._words.get(code)) is None:
+            words = self._words[code] = array("H")
+            present = self._present[code] = bytearray()
+        else:
+            present = self._present[code]
+        if (size := address + len(value) - len(words)) > 0:
+            words.frombytes(bytes(size * words.itemsize))
+            present.extend(bytes(size))
+        words[address:address + len(value)] = value if isinstance(value, array) and value.typecode == "H" else array("H", value)
+        present[address:address + len(value)] = b"\x01" * len(value)
+
+    def is_present(self, code: int, address: int):
+        return (present := self._present.get(code)) is not None and address < len(present) and present[address] == 1
+
+    def get_value(self, code: int, address: int):
+        return self._words[code][address] if self.is_present(code, address) else None
+
+def get_addr_value(data: RegisterImage, code, addr):
+    return data.get_value(code, addr)
 
 def ilen(object):
     return len(object) if not isinstance(object, int) else 1
@@ -29,7 +29,7 @@ CREATION_SCHEMA = {
 CONFIGURATION_SCHEMA = {
     vol.Required(CONF_HOST, default = DEFAULT_[CONF_HOST], description = {SUGGESTED_VALUE: DEFAULT_[CONF_HOST]}): str,
     vol.Optional(CONF_PORT, default = DEFAULT_[CONF_PORT], description = {SUGGESTED_VALUE: DEFAULT_[CONF_PORT]}): cv.port,
-    vol.Optional(CONF_TRANSPORT, default = DEFAULT_[CONF_TRANSPORT], description = {SUGGESTED_VALUE: DEFAULT_[CONF_TRANSPORT]}): SelectSelector(SelectSelectorConfig(options = ["tcp", "modbus_tcp", "modbus_rtu"], mode = "dropdown", translation_key = "transport")),
+    vol.Optional(CONF_TRANSPORT, default = DEFAULT_[CONF_TRANSPORT], description = {SUGGESTED_VALUE: DEFAULT_[CONF_TRANSPORT]}): SelectSelector(SelectSelectorConfig(options = ["tcp", "udp", "modbus_tcp", "modbus_rtu"], mode = "dropdown", translation_key = "transport")),
     vol.Optional(CONF_LOOKUP_FILE, default = DEFAULT_[CONF_LOOKUP_FILE], description = {SUGGESTED_VALUE: DEFAULT_[CONF_LOOKUP_FILE]}): str,
     vol.Required(CONF_ADDITIONAL_OPTIONS): section(
         vol.Schema({
@@ -39,7 +39,10 @@ CONFIGURATION_SCHEMA = {
             vol.Optional(CONF_PACK, default = DEFAULT_[CONF_PACK], description = {SUGGESTED_VALUE: DEFAULT_[CONF_PACK]}): vol.All(vol.Coerce(int), vol.Range(min = -1, max = 20)),
             vol.Optional(CONF_BATTERY_NOMINAL_VOLTAGE, default = DEFAULT_[CONF_BATTERY_NOMINAL_VOLTAGE], description = {SUGGESTED_VALUE: DEFAULT_[CONF_BATTERY_NOMINAL_VOLTAGE]}): cv.positive_float,
             vol.Optional(CONF_BATTERY_LIFE_CYCLE_RATING, default = DEFAULT_[CONF_BATTERY_LIFE_CYCLE_RATING], description = {SUGGESTED_VALUE: DEFAULT_[CONF_BATTERY_LIFE_CYCLE_RATING]}): cv.positive_int,
-            vol.Optional(CONF_MB_SLAVE_ID, default = DEFAULT_[CONF_MB_SLAVE_ID], description = {SUGGESTED_VALUE: DEFAULT_[CONF_MB_SLAVE_ID]}): cv.positive_int
+            vol.Optional(CONF_MB_SLAVE_ID, default = DEFAULT_[CONF_MB_SLAVE_ID], description = {SUGGESTED_VALUE: DEFAULT_[CONF_MB_SLAVE_ID]}): cv.positive_int,
+            vol.Optional(CONF_PIPELINE, default = DEFAULT_[CONF_PIPELINE], description = {SUGGESTED_VALUE: DEFAULT_[CONF_PIPELINE]}): vol.All(vol.Coerce(int), vol.Range(min = 1, max = 16)),
+            vol.Optional(CONF_PUSH, default = DEFAULT_[CONF_PUSH], description = {SUGGESTED_VALUE: DEFAULT_[CONF_PUSH]}): cv.boolean,
+            vol.Optional(CONF_SLAVES, default = DEFAULT_[CONF_SLAVES], description = {SUGGESTED_VALUE: DEFAULT_[CONF_SLAVES]}): str
         }),
         {"collapsed": True}
     )
@@ -53,6 +56,11 @@ async def data_schema(hass: HomeAssistant, data_schema: dict[str, Any]) -> vol.S
 def validate_connection(user_input: dict[str, Any]) -> dict[str, Any]:
     _LOGGER.debug(f"validate_connection: {user_input}")
     error = "unknown"
+    try:
+        parse_slaves(user_input.get(CONF_ADDITIONAL_OPTIONS, {}).get(CONF_SLAVES, DEFAULT_[CONF_SLAVES]))
+    except ValueError:
+        _LOGGER.debug(f"validate_connection: validation failed: {user_input}")
+        return {"base": "invalid_slaves"}
     try:
         if host := user_input.get(CONF_HOST, IP_ANY):
             getaddrinfo(host, user_input.get(CONF_PORT, DEFAULT_[CONF_PORT]), family = 0, type = 0, proto = 0, flags = 0)
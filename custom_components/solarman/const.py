@@ -20,6 +20,7 @@ COMPONENTS_DIRECTORY = "custom_components"
 LOOKUP_DIRECTORY = "inverter_definitions"
 LOOKUP_DIRECTORY_PATH = f"{COMPONENTS_DIRECTORY}/{DOMAIN}/{LOOKUP_DIRECTORY}/"
 LOOKUP_CUSTOM_DIRECTORY_PATH = f"{COMPONENTS_DIRECTORY}/{DOMAIN}/{LOOKUP_DIRECTORY}/custom/"
+LOOKUP_CACHE_PATH = f".storage/{DOMAIN}/{LOOKUP_DIRECTORY}/"
 
 CONF_HOST = "host"
 CONF_PORT = "port"
@@ -33,6 +34,9 @@ CONF_PACK = "pack"
 CONF_BATTERY_NOMINAL_VOLTAGE = "battery_nominal_voltage"
 CONF_BATTERY_LIFE_CYCLE_RATING = "battery_life_cycle_rating"
 CONF_MB_SLAVE_ID = "mb_slave_id"
+CONF_PIPELINE = "pipeline"
+CONF_PUSH = "push"
+CONF_SLAVES = "slaves"
 
 OLD_ = { "name": "name", "serial": "inverter_serial", "sn": "serial", "sn": "sn", CONF_HOST: "inverter_host", CONF_PORT: "inverter_port" }
 
@@ -50,6 +54,9 @@ IS_SINGLE_CODE = "is_single_code"
 REGISTERS_CODE = "registers_code"
 REGISTERS_MIN_SPAN = "registers_min_span"
 REGISTERS_MAX_SIZE = "registers_max_size"
+REGISTERS_PLANNER = "registers_planner"
+REGISTERS_LATENCY = "registers_latency"
+REGISTERS_COST = "registers_cost"
 DIGITS = "digits"
 
 DEFAULT_ = {
@@ -58,6 +65,9 @@ DEFAULT_ = {
     CONF_PORT: 8899,
     CONF_TRANSPORT: "tcp",
     CONF_MB_SLAVE_ID: 1,
+    CONF_PIPELINE: 1,
+    CONF_PUSH: False,
+    CONF_SLAVES: "",
     CONF_LOOKUP_FILE: "Auto",
     CONF_MOD: 0,
     CONF_MPPT: 4,
@@ -70,6 +80,9 @@ DEFAULT_ = {
     REGISTERS_CODE: 0x03,
     REGISTERS_MIN_SPAN: 25,
     REGISTERS_MAX_SIZE: 125,
+    REGISTERS_PLANNER: "greedy",
+    REGISTERS_LATENCY: 300,
+    REGISTERS_COST: 2,
     DIGITS: 6
 }
 
@@ -107,9 +120,69 @@ TIMINGS_INTERVAL = 5
 TIMINGS_INTERVAL_SCALE = 1
 TIMINGS_UPDATE_INTERVAL = timedelta(seconds = TIMINGS_INTERVAL * TIMINGS_INTERVAL_SCALE)
 
+# Upper bound of the cached decode and request plans per profile
+# - every distinct set of response blocks or due update intervals has its own plan, usually just a handful of them
+#
+PARSER_CACHE_SIZE = 64
+
+# Cost model of the optimal request planner in ms (can be set w/ "latency" & "register_cost" in the "default" section of a profile):
+# - latency of a single request round trip over the data logging stick (usually 150 - 600 ms)
+# - transfer cost of a single register (~2 ms for 2 bytes at 9600 baud on the RS485 side)
+# - gaps wider than min_span are never bridged (-1 lifts the limit), so unmapped ranges are not read
+#
+# Requests are split greedily on min_span & max_size by default, profiles opt in to the optimal planner w/ "planner: optimal" in the "default" section
+#
+REQUEST_PLANNER_GREEDY = "greedy"
+REQUEST_PLANNER_OPTIMAL = "optimal"
+REQUEST_MAX_COUNT = 125
+
+# Self-tuning of the request planner from the measured requests of a device (persisted per config entry):
+# - the cost model is refitted from the response times after TUNER_SAMPLES requests, older samples fade out w/ TUNER_DECAY
+# - max_size is cut down to TUNER_BACKOFF % by a failed request larger than TUNER_BACKOFF % of it and grown by TUNER_STEP after TUNER_STREAK successful requests in a row
+#
+TUNER_SAMPLES = 20
+TUNER_DECAY = 0.98
+TUNER_STREAK = 100
+TUNER_STEP = 5
+TUNER_BACKOFF = 75
+TUNER_MIN_SIZE = 10
+TUNER_MIN_COST = 0.01
+TUNER_SAVE_DELAY = 300
+
+# Registers rejected by the device (illegal data address) are found by bisection of the request and not requested anymore:
+# - they are persisted together w/ the fingerprint of the profile & the options and dropped whenever either of them changes
+# - each of them is requested again after HOLES_EXPIRY seconds, a transient rejection doesn't exclude the register for good
+#
+HOLES_EXPIRY = 86400
+
+STORAGE_VERSION = 1
+
+# Data pushed by the logger (V5 DATA, INFO & REPORT frames) is processed w/ the "push" option and a "push" section of the profile:
+# - push: [{ control: 0x42, frame: 0x01, offset: 15, code: 0x03, start: 0x0000, end: 0x0027 }] maps the big-endian words at the byte offset of the payload (from the frame type on) to the registers
+# - items delivered whole by the pushes are not polled until there is no push for PUSH_TIMEOUT seconds
+#
+PUSH_CONTROL = 0x42
+PUSH_TIMEOUT = 300
+
+# Circuit breaker of the polling of an unreachable device (sleeping inverter at night, powered off logger, ..):
+# - opens after BREAKER_THRESHOLD failed polls in a row, the device is rediscovered once and not polled at all until the backoff expires
+# - backoff starts at BREAKER_BACKOFF seconds, doubles w/ every failed probe up to BREAKER_BACKOFF_MAX and is jittered by ±BREAKER_JITTER
+# - half-open breaker probes the device w/ a read of a single register before the whole poll, it's closed again by a successful poll
+#
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+BREAKER_THRESHOLD = 3
+BREAKER_BACKOFF = 15
+BREAKER_BACKOFF_MAX = 900
+BREAKER_JITTER = 0.2
+
 REQUEST_UPDATE_INTERVAL = UPDATE_INTERVAL
 REQUEST_MIN_SPAN = "min_span"
 REQUEST_MAX_SIZE = "max_size"
+REQUEST_PLANNER = "planner"
+REQUEST_LATENCY = "latency"
+REQUEST_COST = "register_cost"
 REQUEST_CODE = "code"
 REQUEST_CODE_ALT = "mb_functioncode"
 REQUEST_START = "start"
@@ -4,7 +4,7 @@ from logging import getLogger
 from itertools import count
 from datetime import timedelta
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
@@ -19,6 +19,7 @@ class Coordinator(DataUpdateCoordinator[dict[str, tuple[int | float | str | list
     def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry[Coordinator]):
         self.device = Device(ConfigurationProvider(hass, config_entry))
         super().__init__(hass, _LOGGER, config_entry = config_entry, name = "", update_interval = TIMINGS_UPDATE_INTERVAL, always_update = False)
+        self.device.listener = self.async_set_pushed_data
 
     @DataUpdateCoordinator.update_interval.setter
     def update_interval(self, value: timedelta | None):
@@ -42,6 +43,13 @@ class Coordinator(DataUpdateCoordinator[dict[str, tuple[int | float | str | list
         self._counter = count(0, int(value))
         self._counter_value = next(self._counter)
 
+    @callback
+    def async_set_pushed_data(self, data: dict[str, tuple[int | float | str | list, int | float | None]]):
+        # Pushed values are merged into the data w/o rescheduling of the polling (unlike async_set_updated_data)
+        if self.data is not None and data:
+            self.data = self.data | data
+            self.async_update_listeners()
+
     async def _async_setup(self):
         await super()._async_setup()
         try:
@@ -71,7 +79,12 @@ class Coordinator(DataUpdateCoordinator[dict[str, tuple[int | float | str | list
         serial_number, _ = self.data.get(slugify("device", "serial", "number", "sensor"), (str(self.device.modbus.serial) if self.device.modbus.serial > 0 else None, None))
         device_info = build_device_info(self.config_entry.entry_id, serial_number, self.device.endpoint.mac, self.device.endpoint.host, self.device.profile.info, self.device.config.name)
         self.device.info[self.config_entry.entry_id] = device_info
-        postprocess_descriptions(self)
+        for subdevice in self.device.subdevices:
+            self.device.info[subdevice.id] = build_device_info(subdevice.id, None, None, None, subdevice.profile.info if subdevice.profile.parser else None, subdevice.config.name) | {"via_device": (DOMAIN, self.config_entry.entry_id)}
+        postprocess_descriptions(self.device.profile.parser, self.data)
+        for subdevice in self.device.subdevices:
+            if subdevice.profile.parser:
+                postprocess_descriptions(subdevice.profile.parser, self.data.get(subdevice.id, {}))
         _LOGGER.debug(device_info)
         return self
 
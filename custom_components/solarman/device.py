@@ -1,10 +1,21 @@
+from __future__ import annotations
+
+import time
+import random
+import hashlib
+
 from logging import getLogger
+from collections.abc import Callable
 from datetime import datetime, timedelta
 
+from homeassistant.helpers.storage import Store
+
 from .const import *
 from .common import *
 from .provider import *
-from .pysolarman import Solarman
+from .planner import RequestTuner
+from .pysolarman.umodbus.exceptions import ModbusError, IllegalDataAddressError
+from .pysolarman import Solarman, SolarmanHandle
 
 _LOGGER = getLogger(__name__)
 
@@ -30,74 +41,271 @@ class DeviceState():
             self.updated = now
         return self.value == -1
 
+class CircuitBreaker():
+    def __init__(self):
+        self.state: str = BREAKER_CLOSED
+        self.failures: int = 0
+        self.backoff: float = 0
+        self.until: float = 0
+
+    @property
+    def allows(self):
+        if self.state == BREAKER_OPEN and time.monotonic() >= self.until:
+            self.state = BREAKER_HALF_OPEN
+        return self.state != BREAKER_OPEN
+
+    @property
+    def remaining(self):
+        return max(0, self.until - time.monotonic()) if self.state == BREAKER_OPEN else 0
+
+    def success(self):
+        self.state, self.failures, self.backoff = BREAKER_CLOSED, 0, 0
+
+    def failure(self):
+        self.failures += 1
+        if self.state == BREAKER_CLOSED and self.failures < BREAKER_THRESHOLD:
+            return False
+        opened, self.state = self.state == BREAKER_CLOSED, BREAKER_OPEN
+        self.backoff = min(BREAKER_BACKOFF_MAX, self.backoff * 2 or BREAKER_BACKOFF)
+        self.until = time.monotonic() + self.backoff * random.uniform(1 - BREAKER_JITTER, 1 + BREAKER_JITTER)
+        return opened
+
 class Device():
-    def __init__(self, config: ConfigurationProvider):
+    def __init__(self, config: ConfigurationProvider | SlaveProvider, parent: Device | None = None):
         self.config = config
+        self.parent = parent
+        self.id = config.config_entry.entry_id if parent is None else slugify(config.config_entry.entry_id, str(config.mb_slave_id))
 
         #self._write_lock = True
 
         self.endpoint: EndPointProvider | None = None
         self.profile: ProfileProvider | None = None
-        self.modbus: Solarman | None = None
+        self.modbus: SolarmanHandle | None = None
+        self.tuner: RequestTuner | None = None
+        self.holes: dict[tuple[int, int], float] = {}
+        self.fingerprint: str | None = None
+        self.listener: Callable[[dict], None] | None = None
+        self.pushed: float | None = None
+        self.subdevices: list[Device] = []
+        self.store = Store(config.hass, STORAGE_VERSION, f"{DOMAIN}.{self.id}")
         self.state = DeviceState()
+        self.breaker = CircuitBreaker()
         self.info = {}
 
     async def setup(self):
         try:
-            self.endpoint = await EndPointProvider(self.config).init()
-            self.modbus = Solarman(*self.endpoint.connection)
-            self.profile = await ProfileProvider(self.config, self.endpoint).init(self.get)
+            # Slaves on the same bus are polled through the endpoint and the connection of the entry
+            self.endpoint = await EndPointProvider(self.config).init() if self.parent is None else self.parent.endpoint
+            self.modbus = Solarman.share(*self.endpoint.connection) if self.parent is None else self.parent.modbus.share(self.config.mb_slave_id)
+            self.profile = await ProfileProvider(self.config, self.endpoint).init(self._get)
+            if self.profile.parser:
+                data = await self.store.async_load() or {}
+                self.tuner = RequestTuner(*self.profile.parser.planning).load(data.get("planner"))
+                self.fingerprint = hashlib.sha1(f"{self.profile.parser.fingerprint}{self.config.config_entry.options}".encode()).hexdigest()
+                self.holes = {(code, address): learned for code, address, learned in data.get("holes", [])} if data.get("profile") == self.fingerprint else {}
+                self.profile.parser.tune(*self.tuner.values)
+                self.profile.parser.avoid(self.holes)
+                if self.config.push and self.parent is None and self.profile.parser.pushable:
+                    self.modbus.push_handler = self.ingest
         except Exception as e:
             raise type(e)(f"{"Timeout" if (x := isinstance(e, TimeoutError)) else "Error"} setuping {self.config.name}{"" if x else f": {strepr(e)}"}") from e
         else:
             self.state.update(True)
 
+        for slave, filename in self.config.slaves:
+            subdevice = Device(SlaveProvider(self.config, slave, filename), self)
+            # Slaves which can't be set up are left out until the entry is reloaded, the primary and the other slaves keep running
+            try:
+                await subdevice.setup()
+                if not subdevice.profile.parser:
+                    raise LookupError(f"Error setuping {subdevice.config.name}: Profile not found")
+            except Exception as e:
+                _LOGGER.warning(f"[{self.endpoint.host}] {strepr(e)}. Slave {slave} is left out")
+                await subdevice.shutdown()
+                continue
+            self.subdevices.append(subdevice)
+
     #def check(self, lock):
     #    if lock and self._write_lock:
     #        raise UserWarning("Entity is locked!")
 
     async def shutdown(self):
+        for subdevice in self.subdevices:
+            await subdevice.shutdown()
         self.state.value = -1
+        if self.tuner:
+            await self.store.async_save(self._store_data())
+        if self.profile and self.profile.parser:
+            self.profile.parser.release()
         if self.modbus:
-            await self.modbus.close()
+            await self.modbus.release()
+
+    def unit(self, slave: int | None):
+        return next((d for d in self.subdevices if d.config.mb_slave_id == slave), self)
+
+    def get_entity_descriptions(self, platform: str):
+        return self.profile.parser.get_entity_descriptions(platform) + [d | {"slave": s.config.mb_slave_id} for s in self.subdevices if s.profile.parser for d in s.profile.parser.get_entity_descriptions(platform)]
+
+    def _store_data(self):
+        return {"planner": self.tuner.data, "profile": self.fingerprint, "holes": sorted([*h, t] for h, t in self.holes.items())}
+
+    def _record(self, count: int, start: float | None, exception: Exception | None = None, alive: bool = True):
+        # Modbus exceptions are responses of the device and failures w/o any answered request in the poll are rather outages, no sign of a request being too large for the logger
+        if not self.tuner or isinstance(exception, ModbusError) or (exception and not alive):
+            return
+
+        tuned = self.tuner.max_size, self.tuner.threshold
+        self.tuner.record(count, (time.perf_counter() - start) * 1000 if start is not None else None, exception is not None)
+        self.profile.parser.tune(*self.tuner.values)
+
+        if tuned != (self.tuner.max_size, self.tuner.threshold):
+            _LOGGER.debug(f"[{self.endpoint.host}] Request planner tuned to: {self.tuner.data}")
+            self.store.async_delay_save(self._store_data, TUNER_SAVE_DELAY)
+
+    def ingest(self, control: int, payload: memoryview):
+        if not (data := self.profile.parser.unpack(control, payload)):
+            return
+
+        self.pushed = time.monotonic()
+
+        if not self.profile.parser.covered.issuperset(registers := {(code, a) for (code, address), words in data.items() for a in range(address, address + len(words))}):
+            _LOGGER.debug(f"[{self.endpoint.host}] Registers {sorted(data)} are pushed by the logger, they won't be polled anymore")
+            self.profile.parser.cover(self.profile.parser.covered | registers)
+
+        try:
+            result = self.profile.parser.ingest(data)
+        except ValueError as e:
+            _LOGGER.debug(f"[{self.endpoint.host}] Pushed data is invalid: {strepr(e)}")
+            return
+
+        _LOGGER.debug(f"[{self.endpoint.host}] Returning {len(result)} pushed value{'s' if len(result) != 1 else ''}")
+        self.state.update()
+
+        if self.listener is not None:
+            self.listener(result)
 
     async def execute(self, code, address, **kwargs):
         _LOGGER.debug(f"[{self.endpoint.host}] Request {code:02} ❘ 0x{code:02X} ~ {address:04} ❘ 0x{address:04X}: {kwargs}")
 
+        return await self.modbus.execute(code, address, **kwargs)
+
+    async def execute_many(self, requests):
+        _LOGGER.debug(f"[{self.endpoint.host}] Requests in flight: {[(code, address, kwargs) for code, address, kwargs in requests]}")
+
+        return await self.modbus.execute_many(requests)
+
+    async def probe(self, request):
+        # Any answer of the device to a single register read, even an exception response, proves it's reachable again
         try:
-            return await self.modbus.execute(code, address, **kwargs)
-        except TimeoutError:
-            await self.endpoint.discover()
-            raise
+            await self.execute(get_request_code(request), request[REQUEST_START], count = 1)
+        except ModbusError:
+            pass
 
-    @retry(ignore = TimeoutError)
-    async def execute_bulk(self, requests, scheduled) -> dict[str | tuple[int, int], tuple[int | float | str | list, int | float | None] | list[int]]:
-        responses: dict[tuple[int, int], list[int]] = {}
+    async def execute_bulk(self, requests, scheduled) -> dict[str, tuple[int | float | str | list, int | float | None]] | RegisterImage:
+        responses = RegisterImage()
+        scheduled = [(get_request_code(request), request[REQUEST_START], request[REQUEST_COUNT]) for request in scheduled]
+        pipelined = await self.execute_many([(code, address, {"count": count}) for code, address, count in scheduled]) if self.modbus.pipelined and len(scheduled) > 1 else None
 
-        for code, address, _, count in ((get_request_code(request), request[REQUEST_START], request[REQUEST_END], request[REQUEST_COUNT]) for request in scheduled):
-            responses[(code, address)] = await self.execute(code, address, count = count)
+        for n, (code, address, count) in enumerate(scheduled):
+            start = time.perf_counter() if pipelined is None else None
+            try:
+                if pipelined is None:
+                    responses[(code, address)] = await self.execute(code, address, count = count)
+                elif isinstance(result := pipelined[n], Exception):
+                    raise result
+                else:
+                    responses[(code, address)] = result
+            except IllegalDataAddressError:
+                if requests is not None or not self.tuner:
+                    raise
+                await self.bisect(code, address, count, responses)
+            except Exception as e:
+                self._record(count, start, e, len(responses) > 0)
+                raise
+            else:
+                self._record(count, start)
 
         return self.profile.parser.process(responses) if requests is None else responses
 
+    async def bisect(self, code, address, count, responses: RegisterImage):
+        if count == 1:
+            _LOGGER.debug(f"[{self.endpoint.host}] Register {code:02} ❘ 0x{code:02X} ~ {address:04} ❘ 0x{address:04X} is rejected by the device, it won't be requested anymore")
+            self.holes[(code, address)] = time.time()
+            self.profile.parser.avoid(self.holes)
+            self.store.async_delay_save(self._store_data, TUNER_SAVE_DELAY)
+            return
+
+        # Halves of the rejected request are retried until the offending addresses are found
+        for a, c in ((address, count // 2), (address + count // 2, count - count // 2)):
+            try:
+                responses[(code, a)] = await self.execute(code, a, count = c)
+            except IllegalDataAddressError:
+                await self.bisect(code, a, c, responses)
+
     async def get(self, runtime = 0, requests = None):
+        if requests is not None or not self.subdevices:
+            return await self._get(runtime, requests)
+
+        try:
+            result, exception = await self._get(runtime), None
+        except Exception as e:
+            result, exception = {}, e
+
+        # Slaves are polled in the same pass, each w/ its own plan, as requests of different slaves can't be merged
+        for subdevice in self.subdevices:
+            try:
+                if (data := await subdevice._get(runtime)) and None not in data:
+                    result[subdevice.id] = data
+            except Exception as e:
+                _LOGGER.debug(f"[{self.endpoint.host}] {"Timeout" if (x := isinstance(e, TimeoutError)) else "Error"} fetching {subdevice.config.name} data{"" if x else f": {strepr(e)}"}")
+
+        # Values of the slaves are returned even w/ the primary slave being unreachable, its entities are unavailable by its state then
+        if exception is not None and not result:
+            raise exception
+
+        return result
+
+    async def _get(self, runtime = 0, requests = None):
+        if self.pushed is not None and self.profile.parser.covered and time.monotonic() - self.pushed > PUSH_TIMEOUT:
+            _LOGGER.debug(f"[{self.endpoint.host}] No data pushed by the logger for {PUSH_TIMEOUT} seconds, all of the registers will be polled again")
+            self.profile.parser.cover(set())
+
+        if self.holes and (now := time.time()) - min(self.holes.values()) > HOLES_EXPIRY:
+            _LOGGER.debug(f"[{self.endpoint.host}] Rejected registers learned more than {HOLES_EXPIRY} seconds ago will be requested again")
+            self.holes = {h: t for h, t in self.holes.items() if now - t <= HOLES_EXPIRY}
+            self.profile.parser.avoid(self.holes)
+            self.store.async_delay_save(self._store_data, TUNER_SAVE_DELAY)
+
         scheduled, scount, result = *ensure_list_safe_len(self.profile.parser.schedule_requests(runtime) if requests is None else requests), {}
 
         if scount == 0:
             return {None: None}
 
+        if not self.breaker.allows:
+            raise ConnectionError(f"{self.config.name} is unreachable, polling is suspended for {self.breaker.remaining:.0f} s")
+
         _LOGGER.debug(f"[{self.endpoint.host}] Scheduling {scount} query request{'s' if scount != 1 else ''}: {scheduled} #{runtime}")
 
         try:
+            if self.breaker.state == BREAKER_HALF_OPEN:
+                _LOGGER.debug(f"[{self.endpoint.host}] Probing {self.config.name} after {self.breaker.backoff} s of the backoff")
+                await self.probe(scheduled[0])
             result = await self.execute_bulk(requests, scheduled)
         except ValueError:
-            pass
+            # Data invalidated by the profile are still an answer of the device
+            self.breaker.success()
         except Exception as e:
-            if self.state.update(exception = e) or runtime == 0:
+            if not isinstance(e, ModbusError) and self.breaker.failure():
+                _LOGGER.debug(f"[{self.endpoint.host}] {self.config.name} is unreachable, polling is suspended for {self.breaker.remaining:.0f} s")
+                await self.endpoint.discover()
+            if self.state.update(exception = e) or runtime == 0 or self.breaker.state == BREAKER_OPEN:
                 await self.modbus.close()
                 if self.profile.parser:
                     self.profile.parser.reset()
                 raise
             _LOGGER.debug(f"[{self.endpoint.host}] {"Timeout" if (x := isinstance(e, TimeoutError)) else "Error"} fetching {self.config.name} data{"" if x else f": {strepr(e)}"}")
+        else:
+            self.breaker.success()
 
         if (rcount := len(result) if result else 0):
             _LOGGER.debug(f"[{self.endpoint.host}] Returning {rcount} new value{'s' if rcount > 1 else ''}")
@@ -11,5 +11,10 @@ async def async_get_config_entry_diagnostics(_: HomeAssistant, config_entry: Con
         "title": config_entry.title,
         "config": async_redact_data(config_entry, TO_REDACT),
         "info": async_redact_data(config_entry.runtime_data.device.info, TO_REDACT),
-        "data": async_redact_data(config_entry.runtime_data.data, TO_REDACT)
+        "data": async_redact_data(config_entry.runtime_data.data, TO_REDACT),
+        "parser": profile.parser.statistics if (profile := config_entry.runtime_data.device.profile) and profile.parser else None,
+        "connection": modbus.statistics if (modbus := config_entry.runtime_data.device.modbus) else None,
+        "planner": tuner.data if (tuner := config_entry.runtime_data.device.tuner) else None,
+        "holes": sorted(config_entry.runtime_data.device.holes),
+        "slaves": {d.config.mb_slave_id: {"parser": d.profile.parser.statistics if d.profile and d.profile.parser else None, "planner": d.tuner.data if d.tuner else None, "holes": sorted(d.holes)} for d in config_entry.runtime_data.device.subdevices}
     }
@@ -22,9 +22,10 @@ _LOGGER = getLogger(__name__)
 class SolarmanCoordinatorEntity(CoordinatorEntity[Coordinator]):
     _attr_has_entity_name = True
 
-    def __init__(self, coordinator: Coordinator):
+    def __init__(self, coordinator: Coordinator, slave: int | None = None):
         super().__init__(coordinator)
-        self._attr_device_info = self.coordinator.device.info.get(self.coordinator.config_entry.entry_id)
+        self.device = self.coordinator.device.unit(slave)
+        self._attr_device_info = self.coordinator.device.info.get(self.device.id)
         self._attr_state: StateType = STATE_UNKNOWN
         self._attr_native_value: StateType | str | date | datetime | time | float | Decimal | None = None
         self._attr_extra_state_attributes: dict[str, Any] = {}
@@ -32,11 +33,16 @@ class SolarmanCoordinatorEntity(CoordinatorEntity[Coordinator]):
 
     @property
     def device_name(self) -> str:
-        return (device_entry.name_by_user or device_entry.name) if (device_entry := self.device_entry) else self.coordinator.device.config.name
+        return (device_entry.name_by_user or device_entry.name) if (device_entry := self.device_entry) else self.device.config.name
 
     @property
     def available(self) -> bool:
-        return self.coordinator.last_update_success and self.coordinator.device.state.value > -1
+        return self.coordinator.last_update_success and self.device.state.value > -1
+
+    @property
+    def data(self) -> dict[str, tuple[int | float | str | list, int | float | None]]:
+        # Values of the slaves polled along w/ the entry are nested under their ids
+        return self.coordinator.data if self.device.parent is None else self.coordinator.data.get(self.device.id, {})
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -57,21 +63,21 @@ class SolarmanCoordinatorEntity(CoordinatorEntity[Coordinator]):
         return True
 
     def update(self):
-        if (data := self.coordinator.data.get(self._attr_key)) is not None and self.set_state(*data) and self.attributes:
+        if (data := self.data.get(self._attr_key)) is not None and self.set_state(*data) and self.attributes:
             if "inverse_sensor" in self.attributes and self._attr_native_value:
                 self._attr_extra_state_attributes["−x"] = -self._attr_native_value
-            for attr in filter(lambda a: a in self.coordinator.data, self.attributes):
-                self._attr_extra_state_attributes[self.attributes[attr].replace(f"{self._attr_name} ", "")] = get_tuple(self.coordinator.data.get(attr))
+            for attr in filter(lambda a: a in self.data, self.attributes):
+                self._attr_extra_state_attributes[self.attributes[attr].replace(f"{self._attr_name} ", "")] = get_tuple(self.data.get(attr))
 
 class SolarmanEntity(SolarmanCoordinatorEntity):
     def __init__(self, coordinator, sensor: dict):
-        super().__init__(coordinator)
+        super().__init__(coordinator, sensor.get("slave"))
 
         self._attr_key = sensor["key"]
         self._attr_name = sensor["name"]
         self._attr_device_class = sensor.get("class") or sensor.get("device_class")
         self._attr_translation_key = sensor.get("translation_key") or slugify(self._attr_name)
-        self._attr_unique_id = slugify(self.coordinator.config_entry.entry_id, self._attr_key)
+        self._attr_unique_id = slugify(self.device.id, self._attr_key)
         self._attr_entity_category = sensor.get("category") or sensor.get("entity_category")
         self._attr_entity_registry_enabled_default = not "disabled" in sensor
         self._attr_entity_registry_visible_default = not "hidden" in sensor
@@ -155,7 +161,7 @@ class SolarmanWritableEntity(SolarmanEntity):
         if isinstance(data, list):
             while len(self.registers) > len(data):
                 data.insert(0, 0)
-        current_data = await self.coordinator.device.execute(self.code_read, self.register if not self.writeback else self.writeback_register, count = (1 if not isinstance(data, list) else len(data)) if not self.writeback else self.writeback_count)
+        current_data = list(await self.device.execute(self.code_read, self.register if not self.writeback else self.writeback_register, count = (1 if not isinstance(data, list) else len(data)) if not self.writeback else self.writeback_count))
         if self.writeback and (writeback_data := list(current_data)):
             for override in self.writeback_overrides:
                 writeback_data[override["register"] - self.writeback_register] = override["value"]
@@ -166,7 +172,7 @@ class SolarmanWritableEntity(SolarmanEntity):
                     writeback_data[self.register + idx - self.writeback_register] = val
             register = self.writeback_register
             data = writeback_data
-        if (current_data == (data if self.code_write > FUNCTION_CODE.WRITE_SINGLE_REGISTER else ensure_list(data)) or await self.coordinator.device.execute(self.code_write, register, data = data) > 0) and state is not None:
+        if (current_data == (data if self.code_write > FUNCTION_CODE.WRITE_SINGLE_REGISTER else ensure_list(data)) or await self.device.execute(self.code_write, register, data = data) > 0) and state is not None:
             self.set_state(state, value)
             self.async_write_ha_state()
             #await self.entity_description.update_fn(self.coordinator., int(value))
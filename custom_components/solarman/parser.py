@@ -1,16 +1,55 @@
 from __future__ import annotations
 
 import re
+import sys
 import bisect
+import hashlib
 
+from array import array
+from copy import deepcopy
 from logging import getLogger
 from datetime import datetime
+from collections.abc import Callable
 
 from .const import *
 from .common import *
+from .planner import is_apart, split_requests, group_optimal
 
 _LOGGER = getLogger(__name__)
 
+# Compiled profiles are cached together w/ the stamps of the modules which are preprocessing them
+_STAMP = tuple(file_stamp(os.path.join(os.path.dirname(__file__), f)) for f in ("const.py", "common.py", "parser.py"))
+_PROFILE = ("info", "_update_interval", "_code", "_min_span", "_max_size", "_planner", "_latency", "_cost", "_digits", "_requests", "_push", "_items", "_is_single_code")
+
+# Preprocessed profiles shared by all the parsers (config entries) using the same profile w/ the same parameters: key -> [stamp, profile, references]
+_PROFILES: dict[tuple, list] = {}
+
+def freeze(value):
+    # Strings are interned so the profiles and all of their items share the same objects for the repeating keys and values
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {sys.intern(k) if isinstance(k, str) else k: freeze(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [freeze(v) for v in value]
+    return value
+
+def is_stateful(definition: dict):
+    return any((v := s.get("validation")) and "dev" in v for s in (definition, *definition.get("sensors", ())))
+
+class Decoder:
+    __slots__ = ("item", "key", "code", "registers", "decode", "cacheable", "raw", "state")
+
+    def __init__(self, item: dict, code: int, decode: Callable):
+        self.item = item
+        self.key = item["key"]
+        self.code = code
+        self.registers = tuple(item["registers"])
+        self.decode = decode
+        self.cacheable = not is_stateful(item)
+        self.raw = None
+        self.state = None
+
 class ParameterParser:
     def __init__(self):
         self._update_interval = DEFAULT_[UPDATE_INTERVAL]
@@ -18,16 +57,67 @@ class ParameterParser:
         self._code = DEFAULT_[REGISTERS_CODE]
         self._min_span = DEFAULT_[REGISTERS_MIN_SPAN]
         self._max_size = DEFAULT_[REGISTERS_MAX_SIZE]
+        self._planner = DEFAULT_[REGISTERS_PLANNER]
+        self._latency = DEFAULT_[REGISTERS_LATENCY]
+        self._cost = DEFAULT_[REGISTERS_COST]
+        self._holes = []
         self._digits = DEFAULT_[DIGITS]
         self._requests = None
+        self._push = []
+        self._covered = set()
+        self._decoders = []
+        self._index = {}
+        self._plans = {}
+        self._schedules = {}
+        self._intervals = ()
         self._previous_result = {}
         self._result = {}
 
+        self._key = None
+        self._stamp = None
+        self._profile = None
+        self._owned = set()
+
         self.info: dict[str, str] = {}
+        self.decoded = 0
+        self.skipped = 0
+
+    async def init(self, path: str, filename: str, parameters: dict, cache: str | None = None):
+        file, profile = path + filename, None
+        stamp = await async_execute(lambda: file_stamp(file)), _STAMP, parameters
+
+        # Profile is shared w/ other entries when already loaded or loaded from the cache when neither the profile, the parameters nor the integration changed
+        if (shared := _PROFILES.get(key := (file, repr(sorted(parameters.items()))))) is not None and shared[0] == stamp:
+            shared[2] += 1
+            profile = shared[1]
+        else:
+            if cache and (c := await pickle_open(cached := f"{cache}{hashlib.sha1(repr(key).encode()).hexdigest()}.pickle")) and c[0] == stamp:
+                profile = freeze(c[1])
+            if profile is None:
+                self.load(await yaml_open(file), filename, parameters)
+                profile = freeze({k: getattr(self, k) for k in _PROFILE})
+                if cache:
+                    await pickle_save(cached, (stamp, profile))
+            _PROFILES[key] = [stamp, profile, 1]
+
+        self._key, self._stamp, self._profile = key, stamp, profile
+
+        for k, v in profile.items():
+            setattr(self, k, v)
+
+        # Items are shared, the list of them is per entry so the modified ones can be replaced by own copies
+        self._items = list(self._items)
+
+        l = (lambda x, y: y - x > self._min_span) if self._min_span > -1 else (lambda x, y: False)
+
+        self._lambda = lambda x, y, z: l(x[1], y[1]) or y[1] - z[1] >= self._max_size or (self._holes and is_apart(self._holes, x, y))
+        self._lambda_code_aware = lambda x, y, z: x[0] != y[0] or self._lambda(x, y, z)
 
-    async def init(self, path: str, filename: str, parameters: dict):
-        profile = await yaml_open(path + filename)
+        self.compile()
 
+        return self
+
+    def load(self, profile: dict, filename: str, parameters: dict):
         if "info" in profile:
             self.info = unwrap(profile["info"], "model", parameters[PARAM_[CONF_MOD]])
         
@@ -42,6 +132,12 @@ class ParameterParser:
                 self._min_span = default[REQUEST_MIN_SPAN]
             if REQUEST_MAX_SIZE in default:
                 self._max_size = default[REQUEST_MAX_SIZE]
+            if REQUEST_PLANNER in default:
+                self._planner = default[REQUEST_PLANNER]
+            if REQUEST_LATENCY in default:
+                self._latency = default[REQUEST_LATENCY]
+            if REQUEST_COST in default:
+                self._cost = max(default[REQUEST_COST], TUNER_MIN_COST)
             if DIGITS in default:
                 self._digits = default[DIGITS]
 
@@ -49,7 +145,10 @@ class ParameterParser:
             _LOGGER.debug("Fine control of request sets is enabled!")
             self._requests = [create_request(get_request_code(r, self._code), r[REQUEST_START], r[REQUEST_END]) for r in profile["requests"]]
 
-        _LOGGER.debug(f"{filename} w/ {'defaults' if 'default' in profile else 'stock values'} for update_interval: {self._update_interval}, code: {self._code}, min_span: {self._min_span}, max_size: {self._max_size}, digits: {self._digits}, parameters: {parameters}")
+        _LOGGER.debug(f"{filename} w/ {'defaults' if 'default' in profile else 'stock values'} for update_interval: {self._update_interval}, code: {self._code}, min_span: {self._min_span}, max_size: {self._max_size}, planner: {self._planner}, latency: {self._latency}, register_cost: {self._cost}, digits: {self._digits}, parameters: {parameters}")
+
+        if "push" in profile:
+            self._push = [(p.get("control", PUSH_CONTROL), p.get("frame"), p.get("offset", 0), get_request_code(p, self._code), p[REQUEST_START], p[REQUEST_END] - p[REQUEST_START] + 1) for p in profile["push"]]
 
         table = {r: get_request_code(pr) for pr in profile["requests"] for r in range(pr[REQUEST_START], pr[REQUEST_END] + 1)} if "requests" in profile and not "requests_fine_control" in profile else {}
 
@@ -59,12 +158,25 @@ class ParameterParser:
             self._is_single_code = is_single_code
             self._code = items_codes[0]
 
-        l = (lambda x, y: y - x > self._min_span) if self._min_span > -1 else (lambda x, y: False)
-
-        self._lambda = lambda x, y, z: l(x[1], y[1]) or y[1] - z[1] >= self._max_size
-        self._lambda_code_aware = lambda x, y, z: x[0] != y[0] or self._lambda(x, y, z)
-
-        return self
+    def release(self):
+        if (shared := _PROFILES.get(self._key)) is not None and shared[1] is self._profile:
+            shared[2] -= 1
+            if shared[2] == 0:
+                del _PROFILES[self._key]
+        self._key = self._stamp = self._profile = None
+
+    @property
+    def fingerprint(self):
+        # Identifies the profile file, its parameters and the integration modules preprocessing it
+        return hashlib.sha1(repr((self._key, self._stamp)).encode()).hexdigest()
+
+    def own(self, item: dict):
+        # Shared profile items have to be copied before they are modified for the entry
+        if id(item) in self._owned:
+            return item
+        self._items[next(n for n, i in enumerate(self._items) if i is item)] = owned = deepcopy(item)
+        self._owned.add(id(owned))
+        return owned
 
     def is_valid(self, parameters):
         return "name" in parameters and "rule" in parameters # and "registers" in parameters
@@ -81,34 +193,100 @@ class ParameterParser:
     def default_from_unit_of_measurement(self, parameters):
         return None if (uom := parameters["uom"] if "uom" in parameters else (parameters["unit_of_measurement"] if "unit_of_measurement" in parameters else "")) and re.match(r"\S+", uom) else ""
 
-    def set_state(self, key, state, value = None):
-        self._result[key] = (state, value)
-
     def get_entity_descriptions(self, platform: str | None = None):
         return [i for i in self._items if self.is_valid(i) and self.is_enabled(i) and not "attribute" in i and (i.get("platform") == platform or platform is None)]
 
     def schedule_requests(self, runtime):
-        self._result = {}
-
         if self._requests:
+            self._result = {}
             return self._requests
 
-        registers = []
+        # The schedule depends only on which of the update intervals are due
+        if (schedule := self._schedules.get(phase := tuple(i for i in self._intervals if runtime % i == 0))) is None:
+            if len(self._schedules) >= PARSER_CACHE_SIZE:
+                self._schedules.clear()
+            schedule = self._schedules[phase] = self._schedule(runtime)
+
+        self._result = dict(schedule[0])
+
+        return schedule[1]
+
+    def _schedule(self, runtime):
+        defaults, registers = {}, set()
 
         for i in self._items:
             if self.is_requestable(i) and self.is_scheduled(i, runtime):
-                self.set_state(i["key"], self.default_from_unit_of_measurement(i))
+                # Items delivered whole by the pushes of the logger are not polled
+                if self._covered and i.get("registers") and self._covered.issuperset((get_code(i, "read"), r) for r in i["registers"]):
+                    continue
+                defaults[i["key"]] = (self.default_from_unit_of_measurement(i), None)
                 if "registers" in i:
-                    for r in sorted(i["registers"]):
-                        if (register := (get_code(i, "read"), r)) and not register in registers:
-                            bisect.insort(registers, register)
+                    registers.update((get_code(i, "read"), r) for r in i["registers"])
+
+        # Addresses rejected by the device are not requested at all
+        registers.difference_update(self._holes)
 
         if len(registers) == 0:
-            return []
+            return defaults, []
 
-        groups = group_when(registers, self._lambda if self._is_single_code or all_same([r[0] for r in registers]) else self._lambda_code_aware)
+        if self._planner == REQUEST_PLANNER_GREEDY:
+            groups = group_when(registers := sorted(registers), self._lambda if self._is_single_code or all_same([r[0] for r in registers]) else self._lambda_code_aware)
+        else:
+            groups = group_optimal(sorted(registers), min(self._max_size, REQUEST_MAX_COUNT), self._latency, self._cost, self._holes, self._min_span)
 
-        return [create_request(self._code if self._is_single_code else r[0][0], r[0][1], r[-1][1]) for r in groups]
+        return defaults, [create_request(self._code if self._is_single_code else r[0][0], r[0][1], r[-1][1]) for r in groups]
+
+    @property
+    def planning(self):
+        return self._latency, self._cost, self._max_size
+
+    def tune(self, latency: float, cost: float, max_size: int):
+        # Schedules are replanned only when the limits or the gap bridging threshold of the planner change
+        if max_size != self._max_size or round(latency / cost) != round(self._latency / self._cost):
+            self._schedules = {}
+        self._latency, self._cost, self._max_size = latency, cost, max_size
+
+    def avoid(self, holes: set[tuple[int, int]]):
+        self._holes = sorted(holes)
+        self._schedules = {}
+        if self._requests:
+            self._requests = list(split_requests(self._requests, self._holes))
+
+    @property
+    def pushable(self):
+        return len(self._push) > 0
+
+    @property
+    def covered(self):
+        return self._covered
+
+    def cover(self, registers: set[tuple[int, int]]):
+        self._covered = registers
+        self._schedules = {}
+
+    def unpack(self, control: int, payload: bytes | memoryview) -> RegisterImage:
+        data = RegisterImage()
+
+        for c, frame, offset, code, start, count in self._push:
+            if c == control and (frame is None or (len(payload) > 0 and payload[0] == frame)) and len(payload) >= offset + count * 2:
+                (words := array("H")).frombytes(payload[offset:offset + count * 2])
+                if sys.byteorder == "little":
+                    words.byteswap()
+                data[(code, start)] = words
+
+        return data
+
+    def ingest(self, data: RegisterImage):
+        # Pushed data is decoded into its own result, the result of the poll in progress stays as is
+        result, self._result = self._result, {}
+        try:
+            return self.process(data)
+        finally:
+            self._result = result
+
+    @property
+    def statistics(self):
+        return {"decoded": self.decoded, "skipped": self.skipped, "hit_rate": round(self.skipped / t, 4) if (t := self.decoded + self.skipped) else None}
 
     def reset(self):
         self._previous_result = {}
@@ -141,313 +319,390 @@ class ParameterParser:
 
         return invalid == 0
 
-    def process(self, data):
+    def process(self, data: RegisterImage):
         if data is not None:
-            for i in self._items:
-                if not (self.is_valid(i) and self.is_enabled(i)):
+            for d in self._plan(data):
+                raw = tuple(data.get_value(d.code, r) for r in d.registers) if d.cacheable else None
+
+                # Unchanged raw data of stateless items leads to the same state
+                if d.cacheable and raw == d.raw:
+                    self.skipped += 1
+                    if d.state is not None:
+                        self._result[d.key] = d.state
                     continue
 
-                # Try parsing if the register is present.
-                if (registers := i.get("registers")) is None:
-                    continue
+                try:
+                    state = d.decode(data)
+                except Exception as e:
+                    _LOGGER.error(f"ParameterParser.try_parse: data: {data}, definition: {d.item} [{strepr(e)}]")
+                    raise
+
+                self.decoded += 1
+
+                if state is not None:
+                    self._result[d.key] = state
 
-                # Check that the first register in the definition is within the register set in the raw data.
-                if get_start_addr(data, get_code(i, "read"), registers[0]) is not None:
-                    try:
-                        match i["rule"]:
-                            case 1 | 3:
-                                self.try_parse_unsigned(data, i)
-                            case 2 | 4:
-                                self.try_parse_signed(data, i)
-                            case 5:
-                                self.try_parse_ascii(data, i)
-                            case 6:
-                                self.try_parse_bits(data, i)
-                            case 7:
-                                self.try_parse_version(data, i)
-                            case 8:
-                                self.try_parse_datetime(data, i)
-                            case 9:
-                                self.try_parse_time(data, i)
-                            case 10:
-                                self.try_parse_raw(data, i)
-                    except Exception as e:
-                        _LOGGER.error(f"ParameterParser.try_parse: data: {data}, definition: {i} [{strepr(e)}]")
-                        raise
+                if d.cacheable:
+                    d.raw, d.state = raw, state
 
         return self._result
 
-    def _read_registers(self, data, definition):
+    def compile(self):
+        self._decoders, self._index, self._plans, self._schedules = [Decoder(i, code, decode) for i in self._items if self.is_valid(i) and self.is_enabled(i) and i.get("registers") and (code := get_code(i, "read")) is not None and (decode := self._compile(i)) is not None], {}, {}, {}
+        self._intervals = tuple(sorted({i.get(REQUEST_UPDATE_INTERVAL, self._update_interval) for i in self._items if self.is_requestable(i) and not "realtime" in i}))
+
+        # Reverse index from the first register of an item to its decoder
+        for n, d in sorted(enumerate(self._decoders), key = lambda x: (x[1].code, x[1].registers[0])):
+            index = self._index.setdefault(d.code, ([], []))
+            index[0].append(d.registers[0])
+            index[1].append(n)
+
+    def _plan(self, data: RegisterImage):
+        if (plan := self._plans.get(blocks := tuple((code, address, len(words)) for (code, address), words in data.items()))) is None:
+            if len(self._plans) >= PARSER_CACHE_SIZE:
+                self._plans.clear()
+
+            # Only the items which have the first register in the raw data are decoded
+            indexes = {n for code, address, count in blocks if (index := self._index.get(code)) for n in index[1][bisect.bisect_left(index[0], address):bisect.bisect_left(index[0], address + count)]}
+            plan = self._plans[blocks] = [self._decoders[n] for n in sorted(indexes)]
+
+        return plan
+
+    def _compile(self, definition):
+        match definition["rule"]:
+            case 1 | 3:
+                return self._compile_unsigned(definition)
+            case 2 | 4:
+                return self._compile_signed(definition)
+            case 5:
+                return self._compile_ascii(definition)
+            case 6:
+                return self._compile_bits(definition)
+            case 7:
+                return self._compile_version(definition)
+            case 8:
+                return self._compile_datetime(definition)
+            case 9:
+                return self._compile_time(definition)
+            case 10:
+                return self._compile_raw(definition)
+        return None
+
+    def _compile_registers(self, definition):
+        if not (registers := definition.get("registers")):
+            return lambda _: None
+
         code = get_code(definition, "read")
-        value = 0
-        shift = 0
+        shifts = tuple((r, 16 * n) for n, r in enumerate(registers))
+        range, key = definition.get("range"), definition.get("key")
+        mask, bit, bitmask = definition.get("mask"), definition.get("bit"), definition.get("bitmask")
+        offset, scale, divide = (definition.get("offset"), definition.get("scale"), definition.get("divide")) if "lookup" not in definition else (None, None, None)
 
-        if not (registers := definition.get("registers")):
-            return None
+        def read(data):
+            value = 0
 
-        for r in registers:
-            if (temp := get_addr_value(data, code, r)) is None:
-                return None
+            for r, shift in shifts:
+                if (temp := data.get_value(code, r)) is None:
+                    return None
 
-            value += (temp & 0xFFFF) << shift
-            shift += 16
+                value += (temp & 0xFFFF) << shift
 
-        if (range := definition.get("range")) and not self.in_range(definition["key"], value, range):
-            return range.get("default")
+            if range and not self.in_range(key, value, range):
+                return range.get("default")
 
-        if (mask := definition.get("mask")) is not None:
-            value &= mask
+            if mask is not None:
+                value &= mask
 
-        if (bit := definition.get("bit")) is not None:
-            value = (value >> bit) & 1
+            if bit is not None:
+                value = (value >> bit) & 1
 
-        if (bitmask := definition.get("bitmask")) is not None:
-            value = int((value & bitmask) / bitmask)
+            if bitmask is not None:
+                value = int((value & bitmask) / bitmask)
 
-        if "lookup" not in definition:
-            if (offset := definition.get("offset")) is not None:
+            if offset is not None:
                 value -= offset
 
-            if (scale := definition.get("scale")) is not None:
+            if scale is not None:
                 value *= scale
 
-            if (divide := definition.get("divide")) is not None:
+            if divide is not None:
                 value //= divide
 
-        return value
+            return value
 
-    def _read_registers_signed(self, data, definition):
-        code = get_code(definition, "read")
-        magnitude = definition.get("magnitude", False)
-        maxint = 0
-        value = 0
-        shift = 0
+        return read
 
+    def _compile_registers_signed(self, definition):
         if not (registers := definition.get("registers")):
-            return None
+            return lambda _: None
 
-        for r in registers:
-            if (temp := get_addr_value(data, code, r)) is None:
-                return None
+        code = get_code(definition, "read")
+        shifts = tuple((r, 16 * n) for n, r in enumerate(registers))
+        maxint = (1 << (16 * len(registers))) - 1
+        magnitude = definition.get("magnitude", False)
+        range, key = definition.get("range"), definition.get("key")
+        offset, scale, divide = definition.get("offset"), definition.get("scale"), definition.get("divide")
 
-            maxint <<= 16
-            maxint |= 0xFFFF
-            value += (temp & 0xFFFF) << shift
-            shift += 16
+        def read(data):
+            value = 0
 
-        if value > (maxint >> 1):
-            value = (value - maxint - 1) if not magnitude else -(value & (maxint >> 1))
+            for r, shift in shifts:
+                if (temp := data.get_value(code, r)) is None:
+                    return None
 
-        if (range := definition.get("range")) and not self.in_range(definition["key"], value, range):
-            return range.get("default")
+                value += (temp & 0xFFFF) << shift
 
-        if (offset := definition.get("offset")) is not None:
-            value -= offset
+            if value > (maxint >> 1):
+                value = (value - maxint - 1) if not magnitude else -(value & (maxint >> 1))
 
-        if (scale := definition.get("scale")) is not None:
-            value *= scale
+            if range and not self.in_range(key, value, range):
+                return range.get("default")
 
-        if (divide := definition.get("divide")) is not None:
-            value //= divide
+            if offset is not None:
+                value -= offset
 
-        return value
-    
-    def _read_registers_custom(self, data, definition):
-        value = 0
+            if scale is not None:
+                value *= scale
 
-        for s in definition["sensors"]:
-            if not (registers := s.get("registers")):
-                continue
+            if divide is not None:
+                value //= divide
 
-            if (n := self._read_registers(data, s) if not "signed" in s else self._read_registers_signed(data, s)) is None:
-                return None
+            return value
 
-            if (m := s.get("multiply")) and (c := self._read_registers(data, m) if not "signed" in m else self._read_registers_signed(data, m)) is not None:
-                n *= c
+        return read
 
-            if (validation := s.get("validation")) is not None and not self.do_validate(registers, n, validation):
-                if (d := validation.get("default")) is None:
-                    continue
-                n = d
+    def _compile_registers_custom(self, definition):
+        sensors = tuple((registers, self._compile_registers(s) if not "signed" in s else self._compile_registers_signed(s), (self._compile_registers(m) if not "signed" in m else self._compile_registers_signed(m)) if (m := s.get("multiply")) else None, s.get("validation"), s.get("operator")) for s in definition["sensors"] if (registers := s.get("registers")))
 
-            if (o := s.get("operator")) is None:
-                value += n
-            else:
-                match o:
-                    case "subtract":
-                        value -= n
-                    case "multiply":
-                        value *= n
-                    case "divide" if n != 0:
-                        value /= n
-                    case _:
-                        value += n
-
-        return value
-
-    def try_parse_unsigned(self, data, definition):
-        if (value := self._read_registers(data, definition) if not "sensors" in definition else self._read_registers_custom(data, definition)) is None:
-            return
-
-        if "uint" in definition and value < 0:
+        def read(data):
             value = 0
 
-        key = definition["key"]
+            for registers, read_sensor, read_multiply, validation, o in sensors:
+                if (n := read_sensor(data)) is None:
+                    return None
 
-        if "lookup" in definition:
-            self.set_state(key, lookup_value(value, definition["lookup"]), int(value) if len(definition["registers"]) == 1 else list(split_p16b(value)))
-            return
+                if read_multiply is not None and (c := read_multiply(data)) is not None:
+                    n *= c
 
-        if (validation := definition.get("validation")) is not None and not self.do_validate(key, value, validation):
-            if (d := validation.get("default")) is None:
-                return
-            value = d
-
-        self.set_state(key, get_number(value, get_or_def(definition, DIGITS, self._digits)))
-
-        if (a := definition.get("attributes")) is not None and "value" in a:
-            self.set_state(key, self._result[key][0], int(value))
-
-    def try_parse_signed(self, data, definition):
-        if (value := self._read_registers_signed(data, definition) if not "sensors" in definition else self._read_registers_custom(data, definition)) is None:
-            return
-
-        if definition.get("inverted"):
-            value = -value
+                if validation is not None and not self.do_validate(registers, n, validation):
+                    if (d := validation.get("default")) is None:
+                        continue
+                    n = d
 
+                if o is None:
+                    value += n
+                else:
+                    match o:
+                        case "subtract":
+                            value -= n
+                        case "multiply":
+                            value *= n
+                        case "divide" if n != 0:
+                            value /= n
+                        case _:
+                            value += n
+
+            return value
+
+        return read
+
+    def _compile_unsigned(self, definition):
+        read = self._compile_registers(definition) if not "sensors" in definition else self._compile_registers_custom(definition)
         key = definition["key"]
-
-        if (validation := definition.get("validation")) is not None and not self.do_validate(key, value, validation):
-            if (d := validation.get("default")) is None:
+        uint = "uint" in definition
+        lookup = definition.get("lookup")
+        single = len(definition["registers"]) == 1
+        validation = definition.get("validation")
+        digits = get_or_def(definition, DIGITS, self._digits)
+        attribute = (a := definition.get("attributes")) is not None and "value" in a
+
+        def decode(data):
+            if (value := read(data)) is None:
                 return
-            value = d
 
-        self.set_state(key, get_number(value, get_or_def(definition, DIGITS, self._digits)))
+            if uint and value < 0:
+                value = 0
 
-    def try_parse_ascii(self, data, definition):
-        code = get_code(definition, "read")
-        value = ""
+            if lookup is not None:
+                return lookup_value(value, lookup), int(value) if single else list(split_p16b(value))
 
-        for r in definition["registers"]:
-            if (temp := get_addr_value(data, code, r)) is None:
-                return
+            if validation is not None and not self.do_validate(key, value, validation):
+                if (d := validation.get("default")) is None:
+                    return
+                value = d
 
-            value += chr(temp >> 8) + chr(temp & 0xFF)
+            return get_number(value, digits), int(value) if attribute else None
 
-        self.set_state(definition["key"], value)
+        return decode
 
-    def try_parse_bits(self, data, definition):
-        code = get_code(definition, "read")
-        value = []
+    def _compile_signed(self, definition):
+        read = self._compile_registers_signed(definition) if not "sensors" in definition else self._compile_registers_custom(definition)
+        key = definition["key"]
+        inverted = definition.get("inverted")
+        validation = definition.get("validation")
+        digits = get_or_def(definition, DIGITS, self._digits)
 
-        for r in definition["registers"]:
-            if (temp := get_addr_value(data, code, r)) is None:
+        def decode(data):
+            if (value := read(data)) is None:
                 return
 
-            value.append(hex(temp))
+            if inverted:
+                value = -value
 
-        self.set_state(definition["key"], value)
+            if validation is not None and not self.do_validate(key, value, validation):
+                if (d := validation.get("default")) is None:
+                    return
+                value = d
 
-    def try_parse_version(self, data, definition):
-        code = get_code(definition, "read")
-        f = "{:1x}" if "hex" in definition else "{:1d}"
-        delimiter_digit, delimiter_register = (d, "-") if (d := definition.get("delimiter", '.')) is not None and isinstance(d, str) else (d.get("digit", "."), d.get("register", "-"))
-        value = ""
+            return get_number(value, digits), None
 
-        registers_count = len(definition["registers"])
+        return decode
 
-        for r in definition["registers"]:
-            if (temp := get_addr_value(data, code, r)) is None:
-                return
+    def _compile_ascii(self, definition):
+        code, registers = get_code(definition, "read"), definition["registers"]
 
-            value += f.format(temp >> 12) + delimiter_digit + f.format(temp >> 8 & 0x0F) + delimiter_digit + f.format(temp >> 4 & 0x0F) + delimiter_digit + f.format(temp & 0x0F)
+        def decode(data):
+            value = ""
 
-            if registers_count > 1:
-                value += delimiter_register
+            for r in registers:
+                if (temp := data.get_value(code, r)) is None:
+                    return
 
-        if value.endswith(delimiter_register):
-            value = value[:-1]
+                value += chr(temp >> 8) + chr(temp & 0xFF)
 
-        if (remove := definition.get("remove")) is not None:
-            value = value.replace(remove, "")
+            return value, None
 
-        self.set_state(definition["key"], value.upper())
+        return decode
 
-    def try_parse_datetime(self, data, definition):
-        code = get_code(definition, "read")
-        value = ""
+    def _compile_bits(self, definition):
+        code, registers = get_code(definition, "read"), definition["registers"]
 
-        registers_count = len(definition["registers"])
+        def decode(data):
+            value = []
 
-        for i, r in enumerate(definition["registers"]):
-            if (temp := get_addr_value(data, code, r)) is None:
-                return
+            for r in registers:
+                if (temp := data.get_value(code, r)) is None:
+                    return
 
-            if registers_count == 3:
-                if i == 0:
-                    value += str(temp >> 8) + "/" + str(temp & 0xFF) + "/"
-                elif i == 1:
-                    value += str(temp >> 8) + " " + str(temp & 0xFF) + ":"
-                elif i == 2:
-                    value += str(temp >> 8) + ":" + str(temp & 0xFF)
-                else:
-                    value += str(temp >> 8) + str(temp & 0xFF)
-            elif registers_count == 6:
-                if i == 0 or i == 1:
-                    value += str(temp) + "/"
-                elif i == 2:
-                    value += str(temp) + " "
-                elif i == 3 or i == 4:
-                    value += str(temp) + ":"
-                else:
-                    value += str(temp)
+                value.append(hex(temp))
 
-        if value.endswith(":"):
-            value = value[:-1]
+            return value, None
 
-        try:
-            if not "platform" in definition:
-                value = datetime.strptime(value, DATETIME_FORMAT)
-            self.set_state(definition["key"], value)
-        except Exception as e:
-            _LOGGER.debug(f"ParameterParser.try_parse_datetime: data: {data}, definition: {definition} [{strepr(e)}]")
+        return decode
 
-    def try_parse_time(self, data, definition):
-        code = get_code(definition, "read")
+    def _compile_version(self, definition):
+        code, registers = get_code(definition, "read"), definition["registers"]
+        f = ("{:1x}" if "hex" in definition else "{:1d}").format
+        delimiter_digit, delimiter_register = (d, "-") if (d := definition.get("delimiter", '.')) is not None and isinstance(d, str) else (d.get("digit", "."), d.get("register", "-"))
+        delimiter = delimiter_register if len(registers) > 1 else ""
+        remove = definition.get("remove")
+
+        def decode(data):
+            value = ""
+
+            for r in registers:
+                if (temp := data.get_value(code, r)) is None:
+                    return
+
+                value += f(temp >> 12) + delimiter_digit + f(temp >> 8 & 0x0F) + delimiter_digit + f(temp >> 4 & 0x0F) + delimiter_digit + f(temp & 0x0F) + delimiter
+
+            if value.endswith(delimiter_register):
+                value = value[:-1]
+
+            if remove is not None:
+                value = value.replace(remove, "")
+
+            return value.upper(), None
+
+        return decode
+
+    def _compile_datetime(self, definition):
+        code, registers = get_code(definition, "read"), definition["registers"]
+        registers_count = len(registers)
+        strptime = not "platform" in definition
+
+        def decode(data):
+            value = ""
+
+            for i, r in enumerate(registers):
+                if (temp := data.get_value(code, r)) is None:
+                    return
+
+                if registers_count == 3:
+                    if i == 0:
+                        value += str(temp >> 8) + "/" + str(temp & 0xFF) + "/"
+                    elif i == 1:
+                        value += str(temp >> 8) + " " + str(temp & 0xFF) + ":"
+                    elif i == 2:
+                        value += str(temp >> 8) + ":" + str(temp & 0xFF)
+                    else:
+                        value += str(temp >> 8) + str(temp & 0xFF)
+                elif registers_count == 6:
+                    if i == 0 or i == 1:
+                        value += str(temp) + "/"
+                    elif i == 2:
+                        value += str(temp) + " "
+                    elif i == 3 or i == 4:
+                        value += str(temp) + ":"
+                    else:
+                        value += str(temp)
+
+            if value.endswith(":"):
+                value = value[:-1]
+
+            try:
+                if strptime:
+                    value = datetime.strptime(value, DATETIME_FORMAT)
+                return value, None
+            except Exception as e:
+                _LOGGER.debug(f"ParameterParser.try_parse_datetime: data: {data}, definition: {definition} [{strepr(e)}]")
+
+        return decode
+
+    def _compile_time(self, definition):
+        code, registers = get_code(definition, "read"), definition["registers"]
         f, d = ("{:02d}", get_or_def(definition, "dec", 100)) if not "hex" in definition else ("{:02x}", get_or_def(definition, "hex", 0x100))
         offset = definition.get("offset")
-        value = ""
+        registers_count = len(registers)
 
-        registers_count = len(definition["registers"])
+        def decode(data):
+            fmt = f
+            value = ""
 
-        for i, r in enumerate(definition["registers"]):
-            if (temp := get_addr_value(data, code, r)) is None:
-                return
+            for i, r in enumerate(registers):
+                if (temp := data.get_value(code, r)) is None:
+                    return
 
-            if registers_count == 1:
-                high, low = div_mod(temp, d)
-                value = str(f.format(int(high))) + ":" + str(f.format(int(low)))
-            else:
-                if temp >= d:
-                    f = "{:02d}"
-                    if offset:
-                        temp -= offset
+                if registers_count == 1:
                     high, low = div_mod(temp, d)
-                    temp = f"{high}{low}"
-                value += str(f.format(int(temp)))
-                if i == 0 or (i == 1 and registers_count > 2):
-                    value += ":"
+                    value = str(fmt.format(int(high))) + ":" + str(fmt.format(int(low)))
+                else:
+                    if temp >= d:
+                        fmt = "{:02d}"
+                        if offset:
+                            temp -= offset
+                        high, low = div_mod(temp, d)
+                        temp = f"{high}{low}"
+                    value += str(fmt.format(int(temp)))
+                    if i == 0 or (i == 1 and registers_count > 2):
+                        value += ":"
 
-        self.set_state(definition["key"], value)
+            return value, None
 
-    def try_parse_raw(self, data, definition):
-        code = get_code(definition, "read")
-        value = []
+        return decode
 
-        for r in definition["registers"]:
-            if (temp := get_addr_value(data, code, r)) is None:
-                return
+    def _compile_raw(self, definition):
+        code, registers = get_code(definition, "read"), definition["registers"]
+
+        def decode(data):
+            value = []
+
+            for r in registers:
+                if (temp := data.get_value(code, r)) is None:
+                    return
+
+                value.append(temp)
 
-            value.append(temp)
+            return value, None
 
-        self.set_state(definition["key"], value)
+        return decode
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import bisect
+
+from math import inf
+
+from .const import *
+from .common import *
+
+def request_cost(count: int, latency: float, cost: float):
+    return latency + cost * count
+
+def plan_cost(requests: list[dict], latency: float, cost: float):
+    return sum(request_cost(r["count"], latency, cost) for r in requests)
+
+def is_apart(holes: list[tuple[int, int]], x: tuple[int, int], y: tuple[int, int]):
+    return (i := bisect.bisect_right(holes, x)) < len(holes) and holes[i] < y
+
+def split_requests(requests: list[dict], holes: list[tuple[int, int]]):
+    for r in requests:
+        code, start, end = get_request_code(r), r[REQUEST_START], r[REQUEST_END]
+        for address in (a for c, a in holes if c == code and start <= a <= end):
+            if address > start:
+                yield create_request(code, start, address - 1)
+            start = address + 1
+        if start <= end:
+            yield create_request(code, start, end)
+
+def group_optimal(iterable: list[tuple[int, int]], max_size: int, latency: float, cost: float, holes: list[tuple[int, int]] = (), min_span: int = -1):
+    x, size = 0, len(iterable)
+    # Requests can't cross function codes so every code is planned separately
+    for i in range(1, size + 1):
+        if i == size or iterable[i][0] != iterable[x][0]:
+            yield from _group_optimal(iterable[x:i], max_size, latency, cost, holes, min_span)
+            x = i
+
+def _group_optimal(iterable: list[tuple[int, int]], max_size: int, latency: float, cost: float, holes: list[tuple[int, int]], min_span: int):
+    size = len(iterable)
+    costs, splits = [0] + [inf] * size, [0] * (size + 1)
+    # Gaps wider than min_span of the profile are never bridged, the cost model only decides about the narrower ones
+    apart = [(min_span > -1 and iterable[i + 1][1] - iterable[i][1] > min_span) or (bool(holes) and is_apart(holes, iterable[i], iterable[i + 1])) for i in range(size - 1)]
+
+    # costs[j] is the cheapest way to read the first j registers, the last request of it starts at splits[j]
+    for j in range(size):
+        i, end = j, iterable[j][1]
+        while i >= 0 and (count := end - iterable[i][1] + 1) <= max_size:
+            if (c := costs[i] + request_cost(count, latency, cost)) < costs[j + 1]:
+                costs[j + 1], splits[j + 1] = c, i
+            # Requests can't span addresses rejected by the device
+            if i > 0 and apart[i - 1]:
+                break
+            i -= 1
+
+    groups, j = [], size
+    while j > 0:
+        groups.append(iterable[splits[j]:j])
+        j = splits[j]
+
+    return reversed(groups)
+
+class RequestTuner:
+    def __init__(self, latency: float, cost: float, max_size: int):
+        self.latency = latency
+        self.cost = max(cost, TUNER_MIN_COST)
+        self.max_size = self.limit = max_size
+        self.requests = 0
+        self.failures = 0
+        self._streak = 0
+        self._sums = [0.0] * 5
+
+    @property
+    def values(self):
+        return self.latency, self.cost, self.max_size
+
+    @property
+    def threshold(self):
+        return round(self.latency / self.cost)
+
+    @property
+    def data(self):
+        return {"latency": round(self.latency, 1), "cost": round(self.cost, 3), "max_size": self.max_size, "threshold": self.threshold, "limit": self.limit, "requests": self.requests, "failures": self.failures}
+
+    def load(self, data: dict | None):
+        if data:
+            self.latency, self.cost, self.max_size = data.get("latency", self.latency), max(data.get("cost", self.cost), TUNER_MIN_COST), min(data.get("max_size", self.max_size), self.limit)
+            self.requests, self.failures = data.get("requests", 0), data.get("failures", 0)
+        return self
+
+    def record(self, count: int, elapsed: float | None, failed: bool = False):
+        if failed:
+            self.failures += 1
+            self._streak = 0
+            # Limit is cut down by one step only by a failure of a request close to it, failures of smaller requests are rather outages than a sign of the size
+            if count > TUNER_MIN_SIZE and count * 100 > self.max_size * TUNER_BACKOFF:
+                self.max_size = max(TUNER_MIN_SIZE, self.max_size * TUNER_BACKOFF // 100)
+            return
+
+        self.requests += 1
+        self._streak += 1
+
+        if self._streak >= TUNER_STREAK and self.max_size < self.limit:
+            self.max_size = min(self.limit, self.max_size + TUNER_STEP)
+            self._streak = 0
+
+        # Response times of pipelined requests overlap and say nothing about their size
+        if elapsed is None:
+            return
+
+        # Exponentially weighted least squares of the response time against the count of registers
+        n, x, y, xx, xy = (v * TUNER_DECAY for v in self._sums)
+        self._sums = n, x, y, xx, xy = n + 1, x + count, y + elapsed, xx + count * count, xy + count * elapsed
+
+        if self.requests < TUNER_SAMPLES:
+            return
+
+        if (variance := n * xx - x * x) > n * n:
+            self.cost = max((n * xy - x * y) / variance, TUNER_MIN_COST)
+
+        self.latency = max((y - self.cost * x) / n, 0)
@@ -53,10 +53,43 @@ class ConfigurationProvider:
     def mb_slave_id(self) -> int:
         return self._additional_options.get(CONF_MB_SLAVE_ID, DEFAULT_[CONF_MB_SLAVE_ID])
 
+    @cached_property
+    def pipeline(self) -> int:
+        return self._additional_options.get(CONF_PIPELINE, DEFAULT_[CONF_PIPELINE])
+
+    @cached_property
+    def push(self) -> bool:
+        return self._additional_options.get(CONF_PUSH, DEFAULT_[CONF_PUSH])
+
+    @cached_property
+    def slaves(self) -> list[tuple[int, str]]:
+        return parse_slaves(self._additional_options.get(CONF_SLAVES, DEFAULT_[CONF_SLAVES]))
+
     @cached_property
     def directory(self):
         return self.hass.config.path(LOOKUP_DIRECTORY_PATH)
 
+    @cached_property
+    def cache(self):
+        return self.hass.config.path(LOOKUP_CACHE_PATH)
+
+@dataclass
+class SlaveProvider:
+    config: ConfigurationProvider
+    mb_slave_id: int
+    filename: str
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.config, attr)
+
+    @cached_property
+    def name(self):
+        return f"{self.config.name} {self.mb_slave_id}"
+
+    @cached_property
+    def slaves(self):
+        return []
+
 @dataclass
 class EndPointProvider:
     config: ConfigurationProvider
@@ -72,8 +105,8 @@ class EndPointProvider:
         return self.config.host
 
     @cached_property
-    def connection(self) -> tuple[str, int, str, int, int, int]:
-        return self.host, self.port, self.transport, self.serial, self.mb_slave_id, TIMINGS_INTERVAL
+    def connection(self) -> tuple[str, int, str, int, int, int, int]:
+        return self.host, self.port, self.transport, self.serial, self.mb_slave_id, TIMINGS_INTERVAL, self.pipeline
 
     @cached_property
     def ip(self):
@@ -134,5 +167,5 @@ class ProfileProvider:
 
     async def init(self, request: Callable[[int, dict], Awaitable[dict]] | None = None):
         if (f := await lookup_profile(request, self.parameters) if self.auto else self.filename) and f != DEFAULT_[CONF_LOOKUP_FILE] and (n := process_profile(f, self.parameters)):
-            self.parser = await ParameterParser().init(self.config.directory, n, self.parameters)
+            self.parser = await ParameterParser().init(self.config.directory, n, self.parameters, self.config.cache)
         return self
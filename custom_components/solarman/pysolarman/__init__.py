@@ -1,21 +1,25 @@
+from __future__ import annotations
+
 import time
 import types
 import struct
 import logging
 import asyncio
 
+from typing import Callable
 from functools import wraps
+from collections import deque
+from contextlib import asynccontextmanager
 from random import randrange
 from logging import getLogger
-from multiprocessing import Event
 
-from .umodbus.functions import FUNCTION_CODES
-from .umodbus.exceptions import error_code_to_exception_map
+from .umodbus.functions import FUNCTION_CODES, WRITE_SINGLE_COIL, WRITE_SINGLE_REGISTER, WRITE_MULTIPLE_COILS, WRITE_MULTIPLE_REGISTERS, expected_response_pdu_size_from_request_pdu
+from .umodbus.exceptions import ModbusError, error_code_to_exception_map
 from .umodbus.client.serial.redundancy_check import get_crc
 from .umodbus.client.serial import rtu
 from .umodbus.client import tcp
 
-from ..common import retry, throttle, create_task, format
+from ..common import retry, create_task, format
 
 _LOGGER = getLogger(__name__)
 
@@ -29,6 +33,7 @@ PROTOCOL.CONTROL_CODE.HEARTBEAT = 0x47
 PROTOCOL.CONTROL_CODE.REPORT = 0x48
 PROTOCOL.CONTROL_CODE_SUFFIX = bytes.fromhex("10")
 PROTOCOL.CONTROL_CODES = PROTOCOL.CONTROL_CODE.__dict__.values()
+PROTOCOL.PUSH_CODES = (PROTOCOL.CONTROL_CODE.DATA, PROTOCOL.CONTROL_CODE.INFO, PROTOCOL.CONTROL_CODE.REPORT)
 PROTOCOL.FRAME_TYPE = bytes.fromhex("02")
 PROTOCOL.STATUS = bytes.fromhex("01")
 PROTOCOL.PLACEHOLDER1 = bytes.fromhex("00")
@@ -37,6 +42,24 @@ PROTOCOL.PLACEHOLDER3 = bytes.fromhex("00000000") # offset time
 PROTOCOL.PLACEHOLDER4 = bytes.fromhex("000000000000000000000000") # delivery|poweron|offset time
 PROTOCOL.START = bytes.fromhex("A5")
 PROTOCOL.END = bytes.fromhex("15")
+PROTOCOL.HEADER = struct.Struct("<BHBBH4s") # start, length, control code w/ suffix, sequence number, serial
+PROTOCOL.REQUEST = struct.Struct("<B2s12s") # frame type, sensor type, delivery|poweron|offset time
+PROTOCOL.RESPONSE = struct.Struct("<BBI4s") # frame type, status, time, offset time
+
+FRAME_GAP = 0.5 # Silence after which an incomplete frame is passed on as is
+PACING_GAP = 0.1 # Initial gap between the starts of requests
+PACING_MIN = 0.02
+PACING_MAX = 2.0
+PACING_DECAY = 0.9
+CONNECTION_GAP = 0.2
+RTT_ALPHA = 1 / 8 # Smoothing of the round trip time and its variation as in RFC 6298
+RTT_BETA = 1 / 4
+RTT_MIN = 0.5 # Floor of the response timeout
+RTT_RETRANSMITS = 2 # Retransmissions of a lost frame before the connection is restarted
+RTT_WRITES = (WRITE_SINGLE_COIL, WRITE_SINGLE_REGISTER, WRITE_MULTIPLE_COILS, WRITE_MULTIPLE_REGISTERS) # Writes are never retransmitted, a write whose response was lost could be applied twice
+
+# Connections shared by the handles of the entries using the same logger: (host, port, transport) -> [connection, references]
+_CONNECTIONS: dict[tuple[str, int | str, str], list] = {}
 
 def log_call(prefix: str):
     def decorator(f):
@@ -60,33 +83,149 @@ def log_return(prefix: str):
 class FrameError(Exception):
     """Frame Validation Error"""
 
+class Pacer:
+    def __init__(self, gap: float):
+        self.gap = gap
+        self._last = 0
+
+    async def wait(self):
+        if (d := self.gap - (time.monotonic() - self._last)) > 0:
+            await asyncio.sleep(d)
+        self._last = time.monotonic()
+
+    def adapt(self, failed: bool = False):
+        # Loggers which don't keep up get twice the time between requests, the gap shrinks back w/ every answered one
+        self.gap = min(PACING_MAX, self.gap * 2) if failed else max(PACING_MIN, self.gap * PACING_DECAY)
+
+class FairLock:
+    def __init__(self):
+        self._locked = False
+        self._waiters: dict[int | None, deque[asyncio.Future]] = {}
+
+    def locked(self):
+        return self._locked
+
+    @asynccontextmanager
+    async def __call__(self, key: int | None = None):
+        if self._locked or self._waiters:
+            self._waiters.setdefault(key, deque()).append(future := asyncio.get_running_loop().create_future())
+            try:
+                await future
+            except asyncio.CancelledError:
+                # Lock handed over to the cancelled waiter is passed on
+                if future.done() and not future.cancelled():
+                    self._release()
+                raise
+        self._locked = True
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self):
+        # Waiters get the lock in turns per key, so a burst of requests of one handle doesn't hold up the others
+        self._locked = False
+        while self._waiters:
+            key, waiters = next(iter(self._waiters.items()))
+            del self._waiters[key]
+            future = waiters.popleft()
+            if waiters:
+                self._waiters[key] = waiters
+            if not future.done():
+                self._locked = True
+                future.set_result(None)
+                return
+
+class DatagramStream(asyncio.DatagramProtocol):
+    def __init__(self):
+        self._transport: asyncio.DatagramTransport | None = None
+        self._datagrams: asyncio.Queue[bytes] = asyncio.Queue()
+
+    def connection_made(self, transport: asyncio.DatagramTransport):
+        self._transport = transport
+
+    def connection_lost(self, exc: Exception | None):
+        self._datagrams.put_nowait(b"")
+
+    def datagram_received(self, data: bytes, addr: tuple):
+        if data:
+            self._datagrams.put_nowait(data)
+
+    def error_received(self, exc: OSError):
+        # Unreachable peer (ICMP) is like a lost datagram, the frame is retransmitted after the timeout
+        _LOGGER.debug(f"Datagram error: {exc!r}")
+
+    async def read(self, n: int = -1):
+        return await self._datagrams.get()
+
+    def write(self, data: bytes):
+        if data:
+            self._transport.sendto(data)
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self._transport.close()
+
+    async def wait_closed(self):
+        pass
+
+async def open_datagram_connection(host: str, port: int | str):
+    _, stream = await asyncio.get_running_loop().create_datagram_endpoint(DatagramStream, remote_addr = (host, int(port)))
+    return stream, stream
+
+class RoundTripTimer:
+    def __init__(self, ceiling: float):
+        self.ceiling = ceiling
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self.timeout = ceiling
+        self.retransmits = 0
+
+    def sample(self, rtt: float):
+        if self.srtt is None:
+            self.srtt, self.rttvar = rtt, rtt / 2
+        else:
+            self.rttvar += RTT_BETA * (abs(self.srtt - rtt) - self.rttvar)
+            self.srtt += RTT_ALPHA * (rtt - self.srtt)
+        self.timeout = min(self.ceiling, max(RTT_MIN, self.srtt + 4 * self.rttvar))
+
+    def backoff(self):
+        self.retransmits += 1
+        self.timeout = min(self.ceiling, self.timeout * 2)
+
 class Solarman:
-    def __init__(self, host: str, port: int | str, transport: str, serial: int, slave: int, timeout: int):
+    def __init__(self, host: str, port: int | str, transport: str, serial: int, slave: int, timeout: int, pipeline: int = 1):
         self.host = host
         self.port = port
-        self.transport = transport
         self.serial = serial
         self.slave = slave
         self.timeout = timeout
+        self.pipeline = pipeline
+        self.transport = transport
 
         self._keeper: asyncio.Task | None = None
         self._reader: asyncio.StreamReader | None = None
         self._writer: asyncio.StreamWriter | None = None
-        self._lock = asyncio.Lock()
-        self._data_queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize = 1)
-        self._data_event = Event()
+        self._lock = FairLock()
+        self._pacer = Pacer(PACING_GAP)
+        self._connection_pacer = Pacer(CONNECTION_GAP)
+        self._rtt = RoundTripTimer(timeout * 3 - 1)
         self._last_frame: bytes | None = None
+        self._buffer = bytearray()
+        self._request: bytearray | None = None
+        self._expected: int | None = None
+        self._pending: dict[int | None, asyncio.Future[bytes]] = {}
+        self.push_handlers: list[Callable[[int, memoryview], None]] = []
 
     @staticmethod
     def _get_response_code(code: int):
         return code - 0x30
 
     @staticmethod
-    def _calculate_checksum(frame: bytes):
-        checksum = 0
-        for d in frame:
-            checksum += d & 0xFF
-        return int(checksum & 0xFF)
+    def _calculate_checksum(frame: bytes | memoryview):
+        return sum(frame) & 0xFF
 
     @property
     def serial(self):
@@ -102,6 +241,21 @@ class Solarman:
                 self._serial = int.from_bytes(value, "little")
                 self.serial_bytes = value
 
+    @property
+    def pipeline(self):
+        return self._pipeline
+
+    @pipeline.setter
+    def pipeline(self, value: int):
+        self._pipeline = max(value, 1)
+        self._window = asyncio.Semaphore(self._pipeline)
+        if hasattr(self, "_transport"):
+            self.transport = self._transport
+
+    @property
+    def pipelined(self):
+        return self._transport == "modbus_tcp" and self._pipeline > 1
+
     @property
     def transport(self):
         return self._transport
@@ -109,41 +263,87 @@ class Solarman:
     @transport.setter
     def transport(self, value: str):
         self._transport = value
-        if value == "tcp":
+        if value in ("tcp", "udp"):
             self._get_response = self._parse_adu_from_sol_response
             self._handle_frame = self._handle_protocol_frame
+        elif self.pipelined:
+            self._get_response = self._parse_adu_from_tcp_pipelined_response
+            self._handle_frame = None
         else:
             self._get_response = self._parse_adu_from_tcp_response if not value.endswith("rtu") else self._parse_adu_from_rtu_response
             self._handle_frame = None
 
+    @property
+    def transaction_id(self):
+        self._transaction_id = ((self._transaction_id + 1) & 0xFFFF) if hasattr(self, "_transaction_id") else randrange(0x0000, 0xFFFF)
+        return self._transaction_id
+
     @property
     def connected(self):
         return self._keeper is not None and not self._keeper.done()
 
+    @property
+    def statistics(self):
+        return {"srtt_ms": round(self._rtt.srtt * 1000, 1) if self._rtt.srtt is not None else None, "rttvar_ms": round(self._rtt.rttvar * 1000, 1) if self._rtt.rttvar is not None else None,
+            "timeout_ms": round(self._rtt.timeout * 1000), "retransmits": self._rtt.retransmits, "pacing_ms": round(self._pacer.gap * 1000), "pipeline": self._pipeline if self.pipelined else 1}
+
     @property
     def sequence_number(self):
         self._sequence_number = ((self._sequence_number + 1) & 0xFF) if hasattr(self, "_sequence_number") else randrange(0x01, 0xFF)
         return self._sequence_number
 
-    def _protocol_header(self, length: int, control: int, seq: bytes):
-        return bytearray(PROTOCOL.START
-            + struct.pack("<H", length)
-            + PROTOCOL.CONTROL_CODE_SUFFIX
-            + struct.pack("<B", control)
-            + seq
-            + self.serial_bytes)
-
-    def _protocol_trailer(self, frame: bytes):
-        return bytearray(struct.pack("<B", self._calculate_checksum(frame[1:])) + PROTOCOL.END)
+    def _protocol_frame(self, length: int, control: int, seq: int, frame: bytearray | None = None):
+        if frame is None or len(frame) != length + 13:
+            frame = bytearray(length + 13)
+        PROTOCOL.HEADER.pack_into(frame, 0, PROTOCOL.START[0], length, PROTOCOL.CONTROL_CODE_SUFFIX[0], control, seq, self.serial_bytes)
+        return frame
+
+    def _protocol_trailer(self, frame: bytearray):
+        with memoryview(frame) as view:
+            frame[-2] = self._calculate_checksum(view[1:-2])
+        frame[-1] = PROTOCOL.END[0]
+        return frame
+
+    def _encode_request(self, pdu: bytes):
+        # Requests are written into the buffer of the connection, only the finished frame is copied
+        self._request = frame = self._protocol_frame(PROTOCOL.REQUEST.size + len(pdu), PROTOCOL.CONTROL_CODE.REQUEST, self.sequence_number, self._request)
+        PROTOCOL.REQUEST.pack_into(frame, PROTOCOL.HEADER.size, PROTOCOL.FRAME_TYPE[0], PROTOCOL.PLACEHOLDER2, PROTOCOL.PLACEHOLDER4)
+        frame[PROTOCOL.HEADER.size + PROTOCOL.REQUEST.size:-2] = pdu
+        return bytes(self._protocol_trailer(frame))
+
+    def _decode_response(self, res: bytes, req: bytes) -> list[int]:
+        if res[4] != self._get_response_code(PROTOCOL.CONTROL_CODE.REQUEST):
+            raise FrameError("Invalid control code")
+        if res[5] != self._sequence_number:
+            raise FrameError("Invalid sequence number")
+        if res[11] != PROTOCOL.FRAME_TYPE[0]:
+            _LOGGER.debug(f"[{self.host}] UNEXPECTED_FRAME_TYPE: {res[11]}")
+        view = memoryview(res)
+        if res[-2] != self._calculate_checksum(view[1:-2]):
+            raise FrameError("Invalid checksum")
+        adu = view[25:-2]
+        if len(adu) < 5: # Short version of modbus exception (undocumented)
+            if len(adu) > 0 and (modbusError := error_code_to_exception_map.get(adu[0])):
+                raise modbusError()
+            raise FrameError("Invalid modbus frame")
+        if adu[-2:] == PROTOCOL.PLACEHOLDER2 and get_crc(adu[:-4]) == adu[-4:-2]: # Double CRC (XXXX0000) correction
+            try:
+                return rtu.parse_response_adu(adu, req)
+            except:
+                adu = adu[:-2]
+        return rtu.parse_response_adu(adu, req)
 
     def _received_frame_is_valid(self, frame: bytes):
         if not frame.startswith(PROTOCOL.START):
             _LOGGER.debug(f"[{self.host}] PROTOCOL_MISMATCH: {frame.hex(" ")}")
             return False
-        if frame[5] != self._sequence_number:
+        # Frames pushed by the logger on its own have a sequence number of the logger, they are accepted only when processed
+        if not (self.push_handlers and frame[4] in PROTOCOL.PUSH_CODES) and frame[5] != self._sequence_number:
             if frame[4] == PROTOCOL.CONTROL_CODE.REQUEST and len(frame) > 6 and (f := int.from_bytes(frame[5:6], "big") == len(frame[6:])) and (int.from_bytes(frame[8:9], "big") == len(frame[9:]) if len(frame) > 9 else f):
                 _LOGGER.debug(f"[{self.host}] TCP_DETECTED: {frame.hex(" ")}")
                 self.transport = "modbus_tcp"
+                if (future := self._pending.pop(self._sequence_number, None)) is not None:
+                    self._pending[self._frame_key(frame)] = future
                 return True
             _LOGGER.debug(f"[{self.host}] SEQ_MISMATCH: {frame.hex(" ")}")
             return False
@@ -157,15 +357,11 @@ class Solarman:
         response_frame = None
         if frame[4] != PROTOCOL.CONTROL_CODE.REQUEST and frame[4] in PROTOCOL.CONTROL_CODES:
             do_continue = False
-            # Maybe do_continue = True for CONTROL_CODE.DATA|INFO|REPORT and thus process packets in the future?
             control_name = [i for i in PROTOCOL.CONTROL_CODE.__dict__ if PROTOCOL.CONTROL_CODE.__dict__[i] == frame[4]][0]
             _LOGGER.debug(f"[{self.host}] PROTOCOL_{control_name} RECV: {frame.hex(" ")}")
-            response_frame = self._protocol_header(10, self._get_response_code(frame[4]), frame[5:7]) + bytearray(PROTOCOL.PLACEHOLDER1 # Frame Type
-                + PROTOCOL.STATUS
-                + struct.pack("<I", int(time.time()))
-                + PROTOCOL.PLACEHOLDER3) # Offset?
-            response_frame[5] = (response_frame[5] + 1) & 0xFF
-            response_frame += self._protocol_trailer(response_frame)
+            response_frame = self._protocol_frame(PROTOCOL.RESPONSE.size, self._get_response_code(frame[4]), (frame[5] + 1) & 0xFF | frame[6] << 8)
+            PROTOCOL.RESPONSE.pack_into(response_frame, PROTOCOL.HEADER.size, PROTOCOL.PLACEHOLDER1[0], PROTOCOL.STATUS[0], int(time.time()), PROTOCOL.PLACEHOLDER3) # Offset?
+            self._protocol_trailer(response_frame)
             _LOGGER.debug(f"[{self.host}] PROTOCOL_{control_name} SENT: {response_frame.hex(" ")}")
         return do_continue, response_frame
 
@@ -185,36 +381,124 @@ class Solarman:
             do_continue, response_frame = self._received_frame_response(frame)
             if response_frame is not None:
                 await self._write(response_frame)
+            if not do_continue and self.push_handlers and frame[4] in PROTOCOL.PUSH_CODES:
+                self._handle_push_frame(frame)
         return do_continue
 
+    def _handle_push_frame(self, frame: bytes):
+        # Payload of the frame (from the frame type on) is passed on w/o the header and the trailer
+        with memoryview(frame) as view:
+            if frame[-2] != self._calculate_checksum(view[1:-2]):
+                _LOGGER.debug(f"[{self.host}] PROTOCOL_PUSH Invalid checksum: {frame.hex(" ")}")
+                return
+            for handler in self.push_handlers:
+                try:
+                    handler(frame[4], view[PROTOCOL.HEADER.size:-2])
+                except Exception as e:
+                    _LOGGER.debug(f"[{self.host}] PROTOCOL_PUSH Processing failed: {e!r}")
+
+    def _frame_size(self, buffer: bytes | bytearray) -> int | None:
+        match self._transport:
+            case "udp": # Datagram is a frame
+                return len(buffer)
+            case "tcp":
+                if buffer[0] != PROTOCOL.START[0]:
+                    return i if (i := buffer.find(PROTOCOL.START)) > 0 else len(buffer)
+                if len(buffer) < 6:
+                    return None
+                if buffer[4] == PROTOCOL.CONTROL_CODE.REQUEST: # Modbus TCP response to the V5 request (TCP_DETECTED)
+                    return 6 + buffer[5]
+                return 13 + int.from_bytes(buffer[1:3], "little")
+            case "modbus_tcp":
+                return 6 + int.from_bytes(buffer[4:6], "big") if len(buffer) >= 6 else None
+            case _:
+                if self._expected is None:
+                    return len(buffer)
+                if len(buffer) < 2:
+                    return None
+                return self._expected if not buffer[1] & 0x80 else 5
+
+    def _frames(self, data: bytes | None):
+        if data is None:
+            _LOGGER.debug(f"[{self.host}] Incomplete frame: {self._buffer.hex(" ")}")
+            yield bytes(self._buffer)
+            self._buffer.clear()
+            return
+        # Most of the reads are exactly one frame which doesn't have to go through the buffer
+        if not self._buffer and self._frame_size(data) == len(data):
+            yield data
+            return
+        self._buffer += data
+        # Frames are split by the length of the transport, so segmented and coalesced frames are handled
+        while self._buffer and (size := self._frame_size(self._buffer)) is not None and size <= len(self._buffer):
+            with memoryview(self._buffer) as view:
+                frame = bytes(view[:size])
+            del self._buffer[:size]
+            yield frame
+
+    def _frame_key(self, frame: bytes) -> int | None:
+        # Requests are matched to the responses by the V5 sequence number or the MBAP transaction id, RTU allows only one request at a time
+        match self._transport:
+            case "tcp" | "udp":
+                return frame[5]
+            case "modbus_tcp":
+                return int.from_bytes(frame[:2], "big")
+            case _:
+                return None
+
+    def _frame_matches(self, frame: bytes) -> bool:
+        # RTU response w/o a key has to be at least of the slave, the function and the size of the pending request, a late reply to the previous one is dropped
+        return self._frame_key(frame) is not None or (request := self._last_frame) is None or len(frame) < 2 or (
+            frame[0] == request[0] and frame[1] & 0x7F == request[1] and (self._expected is None or len(frame) == (self._expected if not frame[1] & 0x80 else 5)))
+
+    def _register(self, frame: bytes) -> asyncio.Future[bytes]:
+        self._pending[self._frame_key(frame)] = future = asyncio.get_running_loop().create_future()
+        return future
+
+    def _unregister(self, future: asyncio.Future[bytes]):
+        for key in [k for k, f in self._pending.items() if f is future]:
+            del self._pending[key]
+
+    def _handle_unsolicited_frame(self, frame: bytes):
+        _LOGGER.debug(f"[{self.host}] Data received too late: {frame.hex(" ")}")
+
+    def _fail_pending(self, exception: Exception):
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(exception)
+
     async def _keeper_loop(self):
         while True:
             try:
-                data = await self._reader.read(1024)
+                data = await asyncio.wait_for(self._reader.read(1024), FRAME_GAP if self._buffer else None)
             except ConnectionResetError:
                 _LOGGER.debug(f"[{self.host}] Connection is reset by the peer. Will try to restart the connection")
                 break
+            except TimeoutError:
+                data = None
             if data == b"":
                 _LOGGER.debug(f"[{self.host}] Connection closed. Will try to restart the connection")
                 break
-            if self._handle_frame is not None and not await self._handle_frame(data):
-                # Skip...
-                continue
-            if not self._data_event.is_set():
-                _LOGGER.debug(f"[{self.host}] Data received too late")
-                continue
-            if not self._data_queue.empty():
-                _ = self._data_queue.get_nowait()
-            self._data_queue.put_nowait(data)
-            self._data_event.clear()
+            for frame in self._frames(data):
+                if self._handle_frame is not None and not await self._handle_frame(frame):
+                    # Skip...
+                    continue
+                if (future := self._pending.get(self._frame_key(frame))) is not None and not future.done() and self._frame_matches(frame):
+                    future.set_result(frame)
+                    continue
+                self._handle_unsolicited_frame(frame)
+        self._buffer.clear()
+        # Serial request is sent again after the reconnection, requests in flight are failed
+        if self.pipelined:
+            self._fail_pending(ConnectionError("Connection is closed"))
         self._keeper = create_task(self._open_connection())
 
-    @throttle(0.2)
     async def _open_connection(self) -> None:
+        await self._connection_pacer.wait()
         try:
-            self._reader, self._writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+            self._reader, self._writer = await asyncio.wait_for((open_datagram_connection if self._transport == "udp" else asyncio.open_connection)(self.host, self.port), self.timeout)
             self._keeper = create_task(self._keeper_loop())
-            if self._data_event.is_set():
+            if self._pending and not self.pipelined:
                 _LOGGER.debug(f"[{self.host}] Successful reconnection! Data expected. Will retry the last request")
                 await self._write(self._last_frame)
             else:
@@ -241,94 +525,207 @@ class Solarman:
 
         self._reader = None
 
-    @throttle(0.1)
-    @log_call("SENT")
-    @log_return("RECV")
-    async def _send_receive_frame(self, frame: bytes):
+    async def _ensure_connection(self):
         if not self._writer:
             if not self.connected:
                 self._keeper = create_task(self._open_connection())
             await self._keeper
 
-        self._data_event.set()
+    @log_call("SENT")
+    @log_return("RECV")
+    async def _send_receive_frame(self, frame: bytes, retransmit: bool = True):
+        await self._ensure_connection()
+        await self._pacer.wait()
+
         self._last_frame = frame
+        future = self._register(frame)
 
         try:
             await self._write(frame)
+            sent, retransmits = time.monotonic(), 0
             while True:
                 try:
-                    return await asyncio.wait_for(self._data_queue.get(), self.timeout * 3 - 1)
+                    result = await asyncio.wait_for(asyncio.shield(future), self._rtt.timeout)
+                    # Round trips of retransmitted frames are ambiguous and don't count (Karn's algorithm)
+                    if retransmits == 0:
+                        self._rtt.sample(time.monotonic() - sent)
+                    return result
                 except TimeoutError:
-                    await self._close()
+                    self._pacer.adapt(True)
+                    self._rtt.backoff()
+                    # Lost frame is sent again right away, the connection is restarted only when that doesn't help either
+                    # RTU responses can't be told apart, so a late duplicate reply could be taken for the next request and the frame is sent again only after the restart
+                    if retransmit and (retransmits := retransmits + 1) <= RTT_RETRANSMITS and self._writer and self._frame_key(frame) is not None:
+                        _LOGGER.debug(f"[{self.host}] Response timeout, retransmitting the frame ({retransmits}/{RTT_RETRANSMITS})")
+                        await self._write(frame)
+                    else:
+                        await self._close()
         finally:
-            self._data_event.clear()
-
-    async def _parse_adu_from_sol_response(self, code: int, address: int, **kwargs) -> list[int]:
-        async def _get_sol_response(frame: bytes) -> bytes:
-            request_frame = self._protocol_header(15 + len(frame),
-                PROTOCOL.CONTROL_CODE.REQUEST,
-                struct.pack("<H", self.sequence_number)
-            ) + bytearray(PROTOCOL.FRAME_TYPE
-                + PROTOCOL.PLACEHOLDER2 # sensor type
-                + PROTOCOL.PLACEHOLDER4 # delivery|poweron|offset time
-                + frame)
-            return await self._send_receive_frame(request_frame + self._protocol_trailer(request_frame))
-        req = rtu.function_code_to_function_map[code](self.slave, address, **kwargs)
-        res = await _get_sol_response(req)
-        if self.serial_bytes == PROTOCOL.PLACEHOLDER3 and self.transport == "tcp":
+            self._unregister(future)
+
+    async def _parse_adu_from_sol_response(self, code: int, address: int, slave: int | None = None, **kwargs) -> list[int]:
+        req = rtu.function_code_to_function_map[code](self.slave if slave is None else slave, address, **kwargs)
+        res = await self._send_receive_frame(self._encode_request(req), code not in RTT_WRITES)
+        if self.serial_bytes == PROTOCOL.PLACEHOLDER3 and self.transport in ("tcp", "udp"):
             self.serial = res[7:11]
             _LOGGER.debug(f"[{self.host}] SERIAL_SET: {self.serial}")
-            res = await _get_sol_response(req)
-        if res[4] != self._get_response_code(PROTOCOL.CONTROL_CODE.REQUEST):
-            raise FrameError("Invalid control code")
-        if res[5] != self._sequence_number:
-            raise FrameError("Invalid sequence number")
-        if res[11:12] != PROTOCOL.FRAME_TYPE:
-            _LOGGER.debug(f"[{self.host}] UNEXPECTED_FRAME_TYPE: {int.from_bytes(res[11:12])}")
-        if res[-2] != self._calculate_checksum(res[1:-2]):
-            raise FrameError("Invalid checksum")
-        res = res[25:-2]
-        if len(res) < 5: # Short version of modbus exception (undocumented)
-            if len (res) > 0 and (modbusError := error_code_to_exception_map.get(res[0])):
-                raise modbusError()
-            raise FrameError("Invalid modbus frame")
-        if res.endswith(PROTOCOL.PLACEHOLDER2) and get_crc(res[:-4]) == res[-4:-2]: # Double CRC (XXXX0000) correction
-            try:
-                return rtu.parse_response_adu(res, req)
-            except:
-                res = res[:-2]
-        return rtu.parse_response_adu(res, req)
+            res = await self._send_receive_frame(self._encode_request(req), code not in RTT_WRITES)
+        return self._decode_response(res, req)
 
-    async def _parse_adu_from_rtu_response(self, code: int, address: int, **kwargs) -> list[int]:
-        req = rtu.function_code_to_function_map[code](self.slave, address, **kwargs)
-        return rtu.parse_response_adu(await self._send_receive_frame(req), req)
+    async def _parse_adu_from_rtu_response(self, code: int, address: int, slave: int | None = None, **kwargs) -> list[int]:
+        req = rtu.function_code_to_function_map[code](self.slave if slave is None else slave, address, **kwargs)
+        self._expected = expected_response_pdu_size_from_request_pdu(req[1:-2]) + 3
+        return rtu.parse_response_adu(await self._send_receive_frame(req, code not in RTT_WRITES), req)
 
-    async def _parse_adu_from_tcp_response(self, code: int, address: int, **kwargs) -> list[int]:
-        req = tcp.function_code_to_function_map[code](self.slave, address, **kwargs)
-        res = await self._send_receive_frame(req)
+    async def _parse_adu_from_tcp_response(self, code: int, address: int, slave: int | None = None, **kwargs) -> list[int]:
+        req = tcp.function_code_to_function_map[code](self.slave if slave is None else slave, address, **kwargs)
+        res = await self._send_receive_frame(req, code not in RTT_WRITES)
         if 8 <= len(res) <= 10: # Incomplete response correction
             res = res[:5] + b'\x06' + res[6:] + (req[len(res):10] if len(req) > 12 else (b'\x00' * (10 - len(res)))) + b'\x00\x01'
         return tcp.parse_response_adu(res, req)
 
+    @log_call("SENT")
+    @log_return("RECV")
+    async def _send_receive_pipelined_frame(self, frame: bytes):
+        await self._ensure_connection()
+        future = self._register(frame)
+        try:
+            await self._write(frame)
+            return await asyncio.wait_for(future, self.timeout * 3 - 1)
+        except TimeoutError:
+            # Peers which don't answer requests in flight (or answer them w/ wrong transaction ids) are handled in serial mode from now on
+            if self.pipelined:
+                _LOGGER.debug(f"[{self.host}] Response to pipelined request is missing. Falling back to serial mode")
+                self.pipeline = 1
+            raise
+        finally:
+            self._unregister(future)
+
+    async def _parse_adu_from_tcp_pipelined_response(self, code: int, address: int, slave: int | None = None, **kwargs) -> list[int]:
+        req = bytearray(tcp.function_code_to_function_map[code](self.slave if slave is None else slave, address, **kwargs))
+        async with self._window:
+            req[:2] = struct.pack(">H", self.transaction_id)
+            res = await self._send_receive_pipelined_frame(req)
+        return tcp.parse_response_adu(res, req)
+
     @retry()
-    async def get_response(self, code: int, address: int, **kwargs):
-        return await self._get_response(code, address, **kwargs)
+    async def get_response(self, code: int, address: int, slave: int | None = None, **kwargs):
+        try:
+            result = await self._get_response(code, address, slave, **kwargs)
+        except ModbusError:
+            self._pacer.adapt()
+            raise
+        except Exception:
+            self._pacer.adapt(True)
+            raise
+        self._pacer.adapt()
+        return result
 
     @log_return("DATA")
-    async def execute(self, code: int, address: int, **kwargs):
+    async def execute(self, code: int, address: int, slave: int | None = None, **kwargs):
         if code not in FUNCTION_CODES:
             raise Exception(f"Invalid modbus function code {code:02}")
 
         async with asyncio.timeout(self.timeout * 6):
-            async with self._lock:
-                return await self.get_response(code, address, **kwargs)
+            async with self._lock(slave):
+                return await self.get_response(code, address, slave, **kwargs)
+
+    async def execute_many(self, requests: list[tuple[int, int, dict]], slave: int | None = None) -> list[list[int] | Exception]:
+        for code, _, _ in requests:
+            if code not in FUNCTION_CODES:
+                raise Exception(f"Invalid modbus function code {code:02}")
+
+        async with asyncio.timeout(self.timeout * 6):
+            async with self._lock(slave):
+                await self._ensure_connection()
+                # Up to pipeline requests are in flight at once, failed ones are retried one by one (in serial mode after a fallback)
+                if self.pipelined:
+                    results = await asyncio.gather(*(self._get_response(code, address, slave, **kwargs) for code, address, kwargs in requests), return_exceptions = True)
+                    for n, ((code, address, kwargs), result) in enumerate(zip(requests, results)):
+                        if isinstance(result, Exception) and not isinstance(result, ModbusError):
+                            try:
+                                results[n] = await self._get_response(code, address, slave, **kwargs)
+                            except Exception as e:
+                                results[n] = e
+                    return results
+                # Otherwise the requests are sent one by one until the first failure
+                results = []
+                for n, (code, address, kwargs) in enumerate(requests):
+                    try:
+                        results.append(await self.get_response(code, address, slave, **kwargs))
+                    except Exception as e:
+                        # Requests following the failed one are not sent and fail the same way
+                        results += [e] * (len(requests) - n)
+                        break
+                return results
 
     @log_call("Closing connection")
     async def close(self):
-        async with self._lock:
+        async with self._lock():
             if self.connected:
                 self._keeper.cancel()
 
             self._keeper = None
 
             await self._close()
+
+    @staticmethod
+    def share(host: str, port: int | str, transport: str, serial: int, slave: int, timeout: int, pipeline: int = 1) -> SolarmanHandle:
+        # Entries using the same logger share one connection instead of competing for the single client slot of the logger
+        if (shared := _CONNECTIONS.get(key := (host, port, transport))) is None:
+            shared = _CONNECTIONS[key] = [Solarman(host, port, transport, serial, slave, timeout, pipeline), 0]
+        else:
+            _LOGGER.debug(f"[{host}] Sharing the connection w/ slave {slave}")
+        shared[1] += 1
+        return SolarmanHandle(shared[0], slave, key)
+
+class SolarmanHandle:
+    def __init__(self, connection: Solarman, slave: int, key: tuple | None = None):
+        self.connection = connection
+        self.slave = slave
+        self._key = key
+        self._push_handler: Callable[[int, memoryview], None] | None = None
+
+    def __getattr__(self, attr: str):
+        return getattr(self.connection, attr)
+
+    @property
+    def push_handler(self):
+        return self._push_handler
+
+    @push_handler.setter
+    def push_handler(self, value: Callable[[int, memoryview], None] | None):
+        if self._push_handler is not None:
+            self.connection.push_handlers.remove(self._push_handler)
+        if value is not None:
+            self.connection.push_handlers.append(value)
+        self._push_handler = value
+
+    @property
+    def shared(self):
+        return (shared := _CONNECTIONS.get(self._key)) is not None and shared[0] is self.connection and shared[1] > 1
+
+    def share(self, slave: int) -> SolarmanHandle:
+        if (shared := _CONNECTIONS.get(self._key)) is not None and shared[0] is self.connection:
+            shared[1] += 1
+        return SolarmanHandle(self.connection, slave, self._key)
+
+    async def execute(self, code: int, address: int, **kwargs):
+        return await self.connection.execute(code, address, self.slave, **kwargs)
+
+    async def execute_many(self, requests: list[tuple[int, int, dict]]) -> list[list[int] | Exception]:
+        return await self.connection.execute_many(requests, self.slave)
+
+    async def close(self):
+        # Connection is restarted only when it isn't used by the handles of other slaves as well
+        if not self.shared:
+            await self.connection.close()
+
+    async def release(self):
+        self.push_handler = None
+        if (shared := _CONNECTIONS.get(self._key)) is not None and shared[0] is self.connection:
+            shared[1] -= 1
+            if shared[1] > 0:
+                return
+            del _CONNECTIONS[self._key]
+        await self.connection.close()
@@ -2,8 +2,17 @@
 
 Most code is taken from: https://github.com/pyhys/minimalmodbus/blob/e99f4d74c83258c6039073082955ac9bed3f2155/minimalmodbus.py  # NOQA
 """
+import sys
 import struct
 
+from array import array
+
+try:
+    from crcmod.predefined import mkPredefinedCrcFun
+    _crc16 = mkPredefinedCrcFun("modbus")
+except ImportError:
+    _crc16 = None
+
 
 def generate_look_up_table():
     """ Generate look up table.
@@ -30,30 +39,59 @@ def generate_look_up_table():
 
 look_up_table = generate_look_up_table()
 
+# Table for the first byte of a 16 bit word, so two bytes are processed per
+# step (CRC is linear, the second byte is looked up in look_up_table).
+look_up_table_word = [(crc >> 8) ^ look_up_table[crc & 0xFF]
+                      for crc in look_up_table]
+
+
+def crc16(msg):
+    """ Return CRC of message as integer.
+
+    :param msg: A bytes-like object.
+    :return: Integer.
+    """
+    if _crc16 is not None:
+        return _crc16(msg if isinstance(msg, (bytes, bytearray)) else bytes(msg))
+
+    table, table_word = look_up_table, look_up_table_word
+    register = 0xFFFF
+    size = len(msg) & ~1
+
+    words = array('H')
+    words.frombytes(msg[:size])
+    if sys.byteorder == 'big':
+        words.byteswap()
+
+    for word in words:
+        value = register ^ word
+        register = table_word[value & 0xFF] ^ table[value >> 8]
+
+    if size < len(msg):
+        register = (register >> 8) ^ table[(register ^ msg[-1]) & 0xFF]
+
+    return register
+
 
 def get_crc(msg):
     """ Return CRC of 2 byte for message.
 
-        >>> assert get_crc(b'\x02\x07') == struct.unpack('<H', b'\x41\x12')
+        >>> assert get_crc(b'\x02\x07') == struct.pack('<H', 0x1241)
 
     :param msg: A byte array.
     :return: Byte array of 2 bytes.
     """
-    register = 0xFFFF
+    # CRC is little-endian!
+    return struct.pack('<H', crc16(msg))
 
-    for byte_ in msg:
-        try:
-            val = struct.unpack('<B', byte_)[0]
-        # Iterating over a bit-like objects in Python 3 gets you ints.
-        # Because fuck logic.
-        except TypeError:
-            val = byte_
 
-        register = \
-            (register >> 8) ^ look_up_table[(register ^ val) & 0xFF]
+def get_crcs(msgs):
+    """ Return CRC of 2 byte for each of messages.
 
-    # CRC is little-endian!
-    return struct.pack('<H', register)
+    :param msgs: Iterable of byte arrays.
+    :return: List of byte arrays of 2 bytes.
+    """
+    return [struct.pack('<H', crc16(msg)) for msg in msgs]
 
 
 def add_crc(msg):
@@ -71,8 +109,7 @@ def validate_crc(msg):
     :param msg: Byte array with message with CRC.
     :raise: CRCError.
     """
-    if not struct.unpack('<H', get_crc(msg[:-2])) ==\
-            struct.unpack('<H', msg[-2:]):
+    if not crc16(msg[:-2]) == struct.unpack('<H', msg[-2:])[0]:
         raise CRCError('CRC validation failed.')
 
 
@@ -57,15 +57,11 @@ A response PDU could look like this::
 """
 from __future__ import division
 import struct
+import sys
 import types
 import math
 
-try:
-    from inspect import getfullargspec
-except ImportError:
-    # inspect.getfullargspec was introduced in Python 3.4.
-    # Earlier versions have inspect.getargspec.
-    from inspect import getargspec as getfullargspec
+from array import array
 
 try:
     from functools import reduce
@@ -78,6 +74,32 @@ from .exceptions import (error_code_to_exception_map,
                                 IllegalDataAddressError)
 from .utils import memoize, get_function_code_from_request_pdu
 
+def unpack_registers(data, quantity):
+    """ Return register values of data of a response.
+
+    Unsigned values are returned as array('H') filled by one copy and
+    byteswap of the big-endian words. Signed values (when configured) are
+    unpacked as list.
+
+    :param data: Bytes-like object with the register values.
+    :param quantity: Number of registers.
+    :return: array('H') or list with register values.
+    """
+    if conf.SIGNED_VALUES:
+        return list(struct.unpack('>' + (conf.TYPE_CHAR * quantity), data))
+
+    if len(data) != 2 * quantity:
+        raise struct.error(
+            'unpack requires a buffer of {0} bytes'.format(2 * quantity))
+
+    values = array('H')
+    values.frombytes(data)
+    if sys.byteorder == 'little':
+        values.byteswap()
+
+    return values
+
+
 # Function related to data access.
 READ_COILS = 1
 READ_DISCRETE_INPUTS = 2
@@ -145,8 +167,7 @@ def create_function_from_response_pdu(resp_pdu, req_pdu=None):
     function_code = pdu_to_function_code_or_raise_error(resp_pdu)
     function = function_code_to_function_map[function_code]
 
-    if req_pdu is not None and \
-        'req_pdu' in getfullargspec(function.create_from_response_pdu).args:  # NOQA
+    if req_pdu is not None and function_code in requires_req_pdu:
 
         return function.create_from_response_pdu(resp_pdu, req_pdu)
 
@@ -743,12 +764,8 @@ class ReadHoldingRegisters(ModbusFunction):
         instance = cls()
         instance.quantity = struct.unpack('>H', req_pdu[-2:])[0]
         instance.byte_count = struct.unpack('>B', resp_pdu[1:2])[0]
-        instance.data = list(
-            struct.unpack(
-                '>' + (conf.TYPE_CHAR * instance.quantity),
-                resp_pdu[2:2 + instance.byte_count]
-            )
-        )
+        instance.data = unpack_registers(
+            resp_pdu[2:2 + instance.byte_count], instance.quantity)
 
         return instance
 
@@ -920,12 +937,8 @@ class ReadInputRegisters(ModbusFunction):
         instance = cls()
         instance.quantity = struct.unpack('>H', req_pdu[-2:])[0]
         instance.byte_count = struct.unpack('>B', resp_pdu[1:2])[0]
-        instance.data = list(
-            struct.unpack(
-                '>' + (conf.TYPE_CHAR * instance.quantity),
-                resp_pdu[2:2 + instance.byte_count]
-            )
-        )
+        instance.data = unpack_registers(
+            resp_pdu[2:2 + instance.byte_count], instance.quantity)
 
         return instance
 
@@ -1628,3 +1641,16 @@ function_code_to_function_map = {
     WRITE_MULTIPLE_COILS: WriteMultipleCoils,
     WRITE_MULTIPLE_REGISTERS: WriteMultipleRegisters,
 }
+
+
+def _requires_req_pdu(function):
+    """ Return whether function needs the request PDU to parse a response,
+    looked up once instead of inspecting the signature on every response.
+    """
+    code = function.create_from_response_pdu.__func__.__code__
+    return 'req_pdu' in code.co_varnames[:code.co_argcount]
+
+
+requires_req_pdu = {function_code for function_code, function
+                    in function_code_to_function_map.items()
+                    if _requires_req_pdu(function)}
@@ -21,7 +21,7 @@ _PLATFORM = get_current_file_name(__name__)
 async def async_setup_entry(_: HomeAssistant, config_entry: ConfigEntry[Coordinator], async_add_entities: AddEntitiesCallback) -> bool:
     _LOGGER.debug(f"async_setup_entry: {config_entry.options}")
 
-    async_add_entities([SolarmanMode(config_entry.runtime_data), SolarmanCloud(config_entry.runtime_data)] + [SolarmanSelectEntity(config_entry.runtime_data, d).init() for d in config_entry.runtime_data.device.profile.parser.get_entity_descriptions(_PLATFORM)])
+    async_add_entities([SolarmanMode(config_entry.runtime_data), SolarmanCloud(config_entry.runtime_data)] + [SolarmanSelectEntity(config_entry.runtime_data, d).init() for d in config_entry.runtime_data.device.get_entity_descriptions(_PLATFORM)])
 
     return True
 
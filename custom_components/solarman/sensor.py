@@ -46,7 +46,7 @@ def _create_entity(coordinator, description, options):
 async def async_setup_entry(_: HomeAssistant, config_entry: ConfigEntry[Coordinator], async_add_entities: AddEntitiesCallback) -> bool:
     _LOGGER.debug(f"async_setup_entry: {config_entry.options}")
 
-    async_add_entities([SolarmanIntervalSensor(config_entry.runtime_data)] + [_create_entity(config_entry.runtime_data, d, config_entry.options).init() for d in config_entry.runtime_data.device.profile.parser.get_entity_descriptions(_PLATFORM)])
+    async_add_entities([SolarmanIntervalSensor(config_entry.runtime_data)] + [SolarmanCircuitBreakerSensor(config_entry.runtime_data, d.config.mb_slave_id if d.parent else None) for d in (config_entry.runtime_data.device, *config_entry.runtime_data.device.subdevices)] + [_create_entity(config_entry.runtime_data, d, config_entry.options).init() for d in config_entry.runtime_data.device.get_entity_descriptions(_PLATFORM)])
 
     return True
 
@@ -78,6 +78,23 @@ class SolarmanIntervalSensor(SolarmanSensorEntity):
     def update(self):
         self.set_state(self.coordinator.device.state.updated_interval.total_seconds())
 
+class SolarmanCircuitBreakerSensor(SolarmanSensorEntity):
+    def __init__(self, coordinator, slave):
+        super().__init__(coordinator, {"key": "circuit_breaker_sensor", "name": "Circuit Breaker", "translation_key": "circuit_breaker_sensor", "options": [BREAKER_CLOSED, BREAKER_HALF_OPEN, BREAKER_OPEN], "slave": slave})
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_device_class = "enum"
+        self._attr_icon = "mdi:electric-switch"
+
+    @property
+    def available(self) -> bool:
+        # Follows the coordinator, the tripped breaker is reported even while the polls fail
+        return super().available or self.device.breaker.state != BREAKER_CLOSED
+
+    def update(self):
+        self.set_state(self.device.breaker.state)
+        self._attr_extra_state_attributes["failures"] = self.device.breaker.failures
+        self._attr_extra_state_attributes["backoff"] = self.device.breaker.backoff
+
 class SolarmanSensor(SolarmanSensorEntity):
     def __init__(self, coordinator, sensor):
         super().__init__(coordinator, sensor)
@@ -86,11 +103,11 @@ class SolarmanSensor(SolarmanSensorEntity):
 class SolarmanNestedSensor(SolarmanSensorEntity):
     def __init__(self, coordinator, sensor):
         super().__init__(coordinator, sensor)
-        parent_device_info = self.coordinator.device.info.get(self.coordinator.config_entry.entry_id)
-        device_serial_number, _ = self.coordinator.data[slugify(sensor["group"], "serial", "number", "sensor")]
+        parent_device_info = self.coordinator.device.info.get(self.device.id)
+        device_serial_number, _ = self.data[slugify(sensor["group"], "serial", "number", "sensor")]
         if not device_serial_number in self.coordinator.device.info:
             self.coordinator.device.info[device_serial_number] = build_device_info(None, str(device_serial_number), None, None, None, parent_device_info["name"])
-            self.coordinator.device.info[device_serial_number]["via_device"] = (DOMAIN, parent_device_info.get("serial_number", self.coordinator.config_entry.entry_id))
+            self.coordinator.device.info[device_serial_number]["via_device"] = (DOMAIN, parent_device_info.get("serial_number", self.device.id))
             self.coordinator.device.info[device_serial_number]["manufacturer"] = parent_device_info["manufacturer"]
             self.coordinator.device.info[device_serial_number]["model"] = None
         self._attr_device_info = self.coordinator.device.info[device_serial_number]
@@ -133,11 +150,11 @@ class SolarmanBatteryCapacitySensor(SolarmanRestoreSensor):
             self._attr_extra_state_attributes["states"] = self._states = state.attributes["states"]
 
     def update(self):
-        if (power := get_tuple(self.coordinator.data.get("battery_power_sensor"))) is not None and (is_charging := power < 0) is not None and (was_charging := (self._temp[-1][0] < 0) if len(self._temp) > 0 else is_charging) is not None:
+        if (power := get_tuple(self.data.get("battery_power_sensor"))) is not None and (is_charging := power < 0) is not None and (was_charging := (self._temp[-1][0] < 0) if len(self._temp) > 0 else is_charging) is not None:
             if (power > -self._threshold and was_charging) or (power < self._threshold and not was_charging):
                 self._temp = []
                 return
-            if (soc := get_tuple(self.coordinator.data.get("battery_sensor"))) is not None and (tb := get_tuple(self.coordinator.data.get("total_battery_charge_sensor" if is_charging else "total_battery_discharge_sensor"))) is not None:
+            if (soc := get_tuple(self.data.get("battery_sensor"))) is not None and (tb := get_tuple(self.data.get("total_battery_charge_sensor" if is_charging else "total_battery_discharge_sensor"))) is not None:
                 self._temp.append((power, soc, tb))
                 h = m = l = s = (soc, tb)
                 for i in reversed(self._temp):
@@ -168,16 +185,16 @@ class SolarmanBatteryCustomSensor(SolarmanSensor):
 
     def update(self):
         #super().update()
-        c = len(self.coordinator.data)
-        if c > 1 or (c == 1 and self._attr_key in self.coordinator.data):
+        c = len(self.data)
+        if c > 1 or (c == 1 and self._attr_key in self.data):
             match self._attr_key:
                 case "battery_soh_sensor":
-                    total_battery_charge = get_tuple(self.coordinator.data.get("total_battery_charge_sensor"))
+                    total_battery_charge = get_tuple(self.data.get("total_battery_charge_sensor"))
                     if total_battery_charge == 0:
                         self.set_state(100)
                         return
-                    battery_capacity = get_tuple(self.coordinator.data.get("battery_capacity_number"))
-                    battery_corrected_capacity = get_tuple(self.coordinator.data.get("battery_corrected_capacity_sensor"))
+                    battery_capacity = get_tuple(self.data.get("battery_capacity_number"))
+                    battery_corrected_capacity = get_tuple(self.data.get("battery_corrected_capacity_sensor"))
                     if battery_capacity and battery_corrected_capacity:
                         battery_capacity_5 = battery_capacity / 100 * 5
                         if battery_capacity - battery_capacity_5 <= battery_corrected_capacity <= battery_capacity + battery_capacity_5:
@@ -185,16 +202,16 @@ class SolarmanBatteryCustomSensor(SolarmanSensor):
                     if total_battery_charge and battery_capacity and self._battery_nominal_voltage and self._battery_life_cycle_rating:
                         self.set_state(get_number(100 - total_battery_charge / get_battery_power_capacity(battery_capacity, self._battery_nominal_voltage) / (self._battery_life_cycle_rating * 0.05), self._digits))
                 case "battery_state_sensor":
-                    battery_power = get_tuple(self.coordinator.data.get("battery_power_sensor"))
+                    battery_power = get_tuple(self.data.get("battery_power_sensor"))
                     if battery_power:
                         self.set_state("discharging" if battery_power > 50 else "charging" if battery_power < -50 else "idle")
                 case "today_battery_life_cycles_sensor":
-                    today_battery_charge = get_tuple(self.coordinator.data.get("today_battery_charge_sensor"))
+                    today_battery_charge = get_tuple(self.data.get("today_battery_charge_sensor"))
                     if today_battery_charge == 0:
                         self.set_state(0)
                         return
-                    battery_capacity = get_tuple(self.coordinator.data.get("battery_capacity_number"))
-                    battery_corrected_capacity = get_tuple(self.coordinator.data.get("battery_corrected_capacity_sensor"))
+                    battery_capacity = get_tuple(self.data.get("battery_capacity_number"))
+                    battery_corrected_capacity = get_tuple(self.data.get("battery_corrected_capacity_sensor"))
                     if battery_capacity and battery_corrected_capacity:
                         battery_capacity_5 = battery_capacity / 100 * 5
                         if battery_capacity - battery_capacity_5 <= battery_corrected_capacity <= battery_capacity + battery_capacity_5:
@@ -202,12 +219,12 @@ class SolarmanBatteryCustomSensor(SolarmanSensor):
                     if today_battery_charge and battery_capacity and self._battery_nominal_voltage:
                         self.set_state(get_number(get_battery_cycles(today_battery_charge, battery_capacity, self._battery_nominal_voltage), self._digits))
                 case "total_battery_life_cycles_sensor":
-                    total_battery_charge = get_tuple(self.coordinator.data.get("total_battery_charge_sensor"))
+                    total_battery_charge = get_tuple(self.data.get("total_battery_charge_sensor"))
                     if total_battery_charge == 0:
                         self.set_state(0)
                         return
-                    battery_capacity = get_tuple(self.coordinator.data.get("battery_capacity_number"))
-                    battery_corrected_capacity = get_tuple(self.coordinator.data.get("battery_corrected_capacity_sensor"))
+                    battery_capacity = get_tuple(self.data.get("battery_capacity_number"))
+                    battery_corrected_capacity = get_tuple(self.data.get("battery_corrected_capacity_sensor"))
                     if battery_capacity and battery_corrected_capacity:
                         battery_capacity_5 = battery_capacity / 100 * 5
                         if battery_capacity - battery_capacity_5 <= battery_corrected_capacity <= battery_capacity + battery_capacity_5:
@@ -30,8 +30,8 @@ VALUE_SCHEMA = {vol.Required(SERVICES_PARAM_VALUE): vol.All(vol.Coerce(int), vol
 VALUES_SCHEMA = {vol.Required(SERVICES_PARAM_VALUES): vol.All(cv.ensure_list, [vol.All(vol.Coerce(int), vol.Range(min = 0, max = 65535))])}
 
 def _get_device(call: ServiceCall):
-    if (config_entry := call.hass.config_entries.async_get_entry(async_get(call.hass).async_get(call.data.get(SERVICES_PARAM_DEVICE)).primary_config_entry)) and config_entry.domain == DOMAIN and isinstance(config_entry.runtime_data, Coordinator):
-        return config_entry.runtime_data.device
+    if (device_entry := async_get(call.hass).async_get(call.data.get(SERVICES_PARAM_DEVICE))) and (config_entry := call.hass.config_entries.async_get_entry(device_entry.primary_config_entry)) and config_entry.domain == DOMAIN and isinstance(config_entry.runtime_data, Coordinator):
+        return next((d for d in config_entry.runtime_data.device.subdevices if (DOMAIN, d.id) in device_entry.identifiers), config_entry.runtime_data.device)
     raise ServiceValidationError("No communication interface for the device found", translation_domain = DOMAIN, translation_key = "no_interface_found")
 
 async def _read_registers(call: ServiceCall, code: int):
@@ -0,0 +1,48 @@
+import os
+import sys
+import struct
+import random
+import pytest
+
+pytest.importorskip("homeassistant")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_components.solarman.pysolarman.umodbus.client.serial import redundancy_check
+
+RNG = random.Random(0)
+# Every message of up to two bytes and random messages of up to 256 bytes
+MESSAGES = [b""] + [bytes([a]) for a in range(256)] + [bytes([a, b]) for a in range(256) for b in range(256)] + [RNG.randbytes(RNG.randrange(257)) for _ in range(10000)]
+
+def crc_reference(msg: bytes):
+    # Per byte CRC of the original umodbus implementation
+    register = 0xFFFF
+    for byte_ in msg:
+        register = (register >> 8) ^ redundancy_check.look_up_table[(register ^ byte_) & 0xFF]
+    return struct.pack("<H", register)
+
+@pytest.fixture(params = ["crcmod", "python"])
+def implementation(request, monkeypatch):
+    # Both the crcmod and the pure python path have to give the same CRC as the reference
+    if request.param == "crcmod" and redundancy_check._crc16 is None:
+        pytest.skip("crcmod is not installed")
+    if request.param == "python":
+        monkeypatch.setattr(redundancy_check, "_crc16", None)
+    return request.param
+
+def test_crc_matches_reference(implementation):
+    for m in MESSAGES:
+        assert redundancy_check.get_crc(m) == crc_reference(m), m.hex()
+
+def test_crc_of_memoryview_matches_reference(implementation):
+    for m in MESSAGES:
+        assert redundancy_check.get_crc(memoryview(b"\x00" + m)[1:]) == crc_reference(m), m.hex()
+
+def test_crcs_match_reference(implementation):
+    assert redundancy_check.get_crcs(MESSAGES[-100:]) == [crc_reference(m) for m in MESSAGES[-100:]]
+
+def test_crc_validation(implementation):
+    for m in MESSAGES[-100:]:
+        redundancy_check.validate_crc(redundancy_check.add_crc(m))
+        with pytest.raises(redundancy_check.CRCError):
+            redundancy_check.validate_crc(m + bytes(a ^ 0xFF for a in crc_reference(m)))
@@ -0,0 +1,73 @@
+import os
+import sys
+import random
+import pytest
+
+pytest.importorskip("homeassistant")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_components.solarman.pysolarman import PROTOCOL, Solarman, expected_response_pdu_size_from_request_pdu
+from custom_components.solarman.pysolarman.umodbus.client.serial import rtu
+
+FRAMES = 200
+
+def stream(transport: str, rng: random.Random):
+    frames, request = [], rtu.read_holding_registers(1, 0, 125)
+    for n in range(FRAMES):
+        data = rng.randbytes(2 * rng.randrange(1, 126))
+        match transport:
+            case "tcp":
+                # Responses w/ heartbeats of the logger in between
+                payload = rng.randbytes(14) + bytes([1, 3, len(data)]) + data + rng.randbytes(2) if n % 4 else rng.randbytes(1)
+                frame = PROTOCOL.START + len(payload).to_bytes(2, "little") + bytes([0x10, 0x15 if n % 4 else 0x47]) + rng.randbytes(6) + payload
+                frames.append(frame + bytes([sum(frame[1:]) & 0xFF]) + PROTOCOL.END)
+            case "modbus_tcp":
+                frames.append(rng.randbytes(2) + bytes(2) + (len(data) + 3).to_bytes(2, "big") + bytes([1, 3, len(data)]) + data)
+            case _:
+                # Responses to the same request and exceptions
+                frames.append(bytes([1, 3, 250]) + rng.randbytes(252) if n % 5 else bytes([1, 0x83, 2]) + rng.randbytes(2))
+    return frames, request
+
+def reads(frames: list[bytes], rng: random.Random, mode: str):
+    match mode:
+        case "aligned":
+            return frames
+        case "segmented":
+            chunks = []
+            for f in frames:
+                cuts = [0, *sorted(rng.sample(range(1, len(f)), min(3, len(f) - 1))), len(f)]
+                chunks.extend(f[i:j] for i, j in zip(cuts, cuts[1:]))
+            return chunks
+        case _:
+            data, chunks = b"".join(frames), []
+            while data:
+                chunks.append(data[:(n := rng.randrange(1, 1025))])
+                data = data[n:]
+            return chunks
+
+def create_connection(transport: str, request: bytes):
+    connection = Solarman("127.0.0.1", 8899, transport, 0, 1, 5)
+    connection._expected = expected_response_pdu_size_from_request_pdu(request[1:-2]) + 3
+    return connection
+
+@pytest.mark.parametrize("mode", ["aligned", "segmented", "coalesced"])
+@pytest.mark.parametrize("transport", ["tcp", "modbus_tcp", "modbus_rtu"])
+def test_reads_are_split_into_sent_frames(transport, mode):
+    rng = random.Random(f"{transport} {mode}")
+    frames, request = stream(transport, rng)
+    connection = create_connection(transport, request)
+
+    assert [f for c in reads(frames, rng, mode) for f in connection._frames(c)] == frames
+    assert not connection._buffer
+
+@pytest.mark.parametrize("transport", ["tcp", "modbus_tcp", "modbus_rtu"])
+def test_incomplete_frame_is_passed_on(transport):
+    frames, request = stream(transport, random.Random(transport))
+    connection = create_connection(transport, request)
+
+    # Frame cut short is kept until the silence, then it's passed on as is and the next one starts clean
+    assert list(connection._frames(frames[1][:-3])) == []
+    assert list(connection._frames(None)) == [frames[1][:-3]]
+    assert list(connection._frames(frames[2])) == [frames[2]]
+    assert not connection._buffer
@@ -0,0 +1,115 @@
+import os
+import sys
+import yaml
+import struct
+import asyncio
+import pytest
+
+from array import array
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+pytest.importorskip("homeassistant")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_components.solarman.const import *
+from custom_components.solarman.common import RegisterImage
+from custom_components.solarman.parser import ParameterParser
+from custom_components.solarman.device import Device
+from custom_components.solarman.pysolarman import PROTOCOL, Solarman
+
+DEFINITIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "custom_components", "solarman", "inverter_definitions", "")
+PARAMETERS = {PARAM_[k]: int(DEFAULT_[k]) for k in PARAM_}
+SERIAL = 3012345678
+
+# No stock profile declares a push layout (it depends on the firmware of the stick), the tests use deye_micro w/ a layout of their own
+LAYOUT = [{"control": 0x42, "frame": 0x01, "offset": 15, "start": 0x0000, "end": 0x003F}]
+
+@pytest.fixture
+def definitions(tmp_path):
+    with open(DEFINITIONS + "deye_micro.yaml") as f:
+        profile = yaml.safe_load(f)
+    with open(tmp_path / "deye_micro.yaml", "w") as f:
+        yaml.safe_dump(profile | {"push": LAYOUT}, f)
+    return str(tmp_path) + os.sep
+
+class Writer:
+    def __init__(self):
+        self.frames = []
+
+    def write(self, data: bytes):
+        self.frames.append(bytes(data))
+
+    async def drain(self):
+        pass
+
+def words():
+    return [(a * 7 + 3) % 20 for a in range(0x40)]
+
+def pushed_frame(connection: Solarman, control: int = PROTOCOL.CONTROL_CODE.DATA):
+    # DATA frame w/ the frame type 0x01, the sensor type and the three timestamps followed by the registers 0x0000 - 0x003F
+    payload = b"\x01" + bytes(14) + b"".join(struct.pack(">H", w) for w in words())
+    frame = connection._protocol_frame(len(payload), control, 0x3A | 0x01 << 8)
+    frame[PROTOCOL.HEADER.size:-2] = payload
+    return bytes(connection._protocol_trailer(frame))
+
+async def create_device(definitions: str):
+    device = Device(SimpleNamespace(hass = MagicMock(), config_entry = SimpleNamespace(entry_id = "push"), push = True))
+    device.endpoint = SimpleNamespace(host = "127.0.0.1")
+    device.profile = SimpleNamespace(parser = await ParameterParser().init(definitions, "deye_micro.yaml", PARAMETERS))
+    device.modbus = Solarman.share("127.0.0.1", 8899, "tcp", SERIAL, 1, 5)
+    device.modbus.connection._writer = Writer()
+    return device
+
+def test_pushed_frame_is_ingested(definitions):
+    async def run():
+        device = await create_device(definitions)
+        connection, results = device.modbus.connection, []
+        device.listener = results.append
+        assert device.profile.parser.pushable
+        device.modbus.push_handler = device.ingest
+
+        await connection._handle_protocol_frame(pushed_frame(connection))
+
+        # Pushed frame is acknowledged and decoded by the same decoders as the polled data
+        assert [f[4] for f in connection._writer.frames] == [connection._get_response_code(PROTOCOL.CONTROL_CODE.DATA)]
+        assert len(results) == 1 and results[0]
+        expected = await ParameterParser().init(DEFINITIONS, "deye_micro.yaml", PARAMETERS)
+        expected.schedule_requests(0)
+        (data := RegisterImage())[(0x03, 0x0000)] = array("H", words())
+        assert results[0] == {k: v for k, v in expected.process(data).items() if k in results[0]}
+
+        # Registers delivered by the push are no longer polled
+        assert device.profile.parser.covered >= {(0x03, a) for a in range(0x40)}
+        # Items reaching beyond the pushed registers (Total Production at 0x003F - 0x0040) are neither decoded from the push nor dropped from the polling
+        assert not any(i["key"] in results[0] for i in device.profile.parser._items if max(i.get("registers") or [0]) > 0x3F)
+        assert any(r[REQUEST_START] <= 0x3F <= r[REQUEST_END] for r in device.profile.parser.schedule_requests(0))
+        assert sum(r[REQUEST_END] - r[REQUEST_START] + 1 for r in device.profile.parser.schedule_requests(0)) < sum(r[REQUEST_END] - r[REQUEST_START] + 1 for r in expected.schedule_requests(0))
+
+        await device.modbus.release()
+
+    asyncio.run(run())
+
+def test_pushed_frame_requires_push_option(definitions):
+    async def run():
+        device = await create_device(definitions)
+        connection = device.modbus.connection
+        connection.sequence_number
+
+        # W/o the push handler frames pushed by the logger are not acknowledged as before
+        assert not await connection._handle_protocol_frame(pushed_frame(connection))
+        assert connection._writer.frames == []
+        assert device.pushed is None
+
+        await device.modbus.release()
+
+    asyncio.run(run())
+
+def test_stock_profiles_declare_no_push():
+    async def run():
+        for f in sorted(os.listdir(DEFINITIONS)):
+            if f.endswith(".yaml"):
+                assert not (await ParameterParser().init(DEFINITIONS, f, PARAMETERS)).pushable, f
+
+    asyncio.run(run())
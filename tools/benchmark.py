@@ -0,0 +1,526 @@
+#
+# Command: py benchmark.py {benchmark} [--root {path}] [options]
+# Example: py benchmark.py parser --polls 1000
+#          py benchmark.py planner
+#          py benchmark.py framer
+#          py benchmark.py pacing
+#          py benchmark.py codec
+#          py benchmark.py crc
+#          py benchmark.py imports
+#          py benchmark.py transports --loss 5
+#          py benchmark.py sharing
+# root:    Repository root with the custom_components directory (can point to another checkout for comparison)
+#
+
+import os
+import sys
+import time
+import struct
+import random
+import subprocess
+import asyncio
+import inspect
+import tempfile
+import tracemalloc
+
+from array import array
+from argparse import ArgumentParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def load(root: str):
+    sys.path.insert(0, root)
+    from custom_components.solarman import const, common, parser
+    return const, common, parser
+
+def load_planner(root: str):
+    sys.path.insert(0, root)
+    from custom_components.solarman import planner
+    return planner
+
+def load_pysolarman(root: str):
+    sys.path.insert(0, root)
+    from custom_components.solarman import pysolarman
+    from custom_components.solarman.pysolarman.umodbus.client import tcp
+    from custom_components.solarman.pysolarman.umodbus.client.serial import rtu
+    return pysolarman, tcp, rtu
+
+def definitions(const):
+    return os.path.join(ROOT, const.LOOKUP_DIRECTORY_PATH)
+
+def profiles(const):
+    return sorted(f for f in os.listdir(definitions(const)) if f.endswith(".yaml"))
+
+def parameters(const):
+    return {const.PARAM_[k]: const.DEFAULT_[k] for k in const.PARAM_}
+
+def responses(common, requests, seed):
+    rng = random.Random(seed)
+    image = getattr(common, "RegisterImage", dict)() # Plain dict for checkouts which predate RegisterImage
+    for r in requests:
+        image[(common.get_request_code(r), r["start"])] = array("H", (rng.randrange(0x10000) if rng.random() < .5 else rng.randrange(0x20) for _ in range(r["count"]))) # As returned by umodbus
+    return image
+
+def rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return 0
+
+def measure(f, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        f()
+    return (time.perf_counter() - start) / count
+
+async def benchmark_parser(args):
+    const, common, parser = load(args.root)
+    total = 0
+
+    print(f"{'profile':<32} {'items':>6} {'requests':>9} {'µs/poll':>10}")
+
+    for f in profiles(const):
+        p = await parser.ParameterParser().init(definitions(const), f, parameters(const))
+        data = responses(common, requests := p.schedule_requests(0), f)
+
+        def poll():
+            try:
+                p.process(data)
+            except ValueError:
+                pass
+
+        total += (t := measure(poll, args.polls))
+
+        print(f"{f:<32} {len(p._items):>6} {len(requests):>9} {t * 1e6:>10.1f}")
+
+    print(f"{'total':<32} {'':>6} {'':>9} {total * 1e6:>10.1f}")
+
+async def benchmark_ticks(args):
+    const, common, parser = load(args.root)
+    total = 0
+
+    print(f"{'profile':<32} {'items':>6} {'requests/tick':>14} {'µs/tick':>10} {'skipped':>8}")
+
+    for f in profiles(const):
+        p = await parser.ParameterParser().init(definitions(const), f, parameters(const))
+        runtimes = range(0, args.ticks * const.TIMINGS_INTERVAL, const.TIMINGS_INTERVAL)
+        datasets = {}
+
+        # Responses are prepared ahead so only scheduling and decoding is measured
+        for runtime in runtimes:
+            if (key := str(requests := p.schedule_requests(runtime))) not in datasets:
+                datasets[key] = responses(common, requests, f)
+
+        requests = 0
+        start = time.perf_counter()
+
+        for runtime in runtimes:
+            requests += len(r := p.schedule_requests(runtime))
+            try:
+                p.process(datasets[str(r)])
+            except ValueError:
+                pass
+
+        total += (t := (time.perf_counter() - start) / len(runtimes))
+
+        print(f"{f:<32} {len(p._items):>6} {requests / len(runtimes):>14.2f} {t * 1e6:>10.1f} {f'{r:.0%}' if (r := getattr(p, 'statistics', {}).get('hit_rate')) is not None else '-':>8}")
+
+    print(f"{'total':<32} {'':>6} {'':>14} {total * 1e6:>10.1f}")
+
+async def setup(parser, path, filename, parameters, cache):
+    start = time.perf_counter()
+    p = await parser.ParameterParser().init(path, filename, parameters, *([cache] if cache else []))
+    elapsed = time.perf_counter() - start
+    # Profiles shared among the parsers are dropped, so every setup loads the YAML (cold) or the pickle (warm)
+    if hasattr(p, "release"):
+        p.release()
+    getattr(parser, "_PROFILES", {}).clear()
+    return elapsed
+
+async def benchmark_profiles(args):
+    const, common, parser = load(args.root)
+    cached = "cache" in inspect.signature(parser.ParameterParser.init).parameters # Checkouts w/o the profile cache only have cold setups
+    totals = [0, 0]
+
+    print(f"{'profile':<32} {'cold ms':>10} {'warm ms':>10} (yaml loader: {getattr(common, 'YamlLoader', common.yaml.SafeLoader).__name__})")
+
+    with tempfile.TemporaryDirectory() as cache:
+        for f in profiles(const):
+            times = []
+
+            for c in [None] + ([cache + os.sep] if cached else []):
+                # First setup fills the cache, the following ones measure it
+                if c:
+                    await setup(parser, definitions(const), f, parameters(const), c)
+                elapsed = 0
+                for _ in range(args.setups):
+                    elapsed += await setup(parser, definitions(const), f, parameters(const), c)
+                times.append(elapsed / args.setups)
+
+            totals = [t + v for t, v in zip(totals, times + [0])]
+
+            print(f"{f:<32}" + "".join(f" {t * 1e3:>10.2f}" for t in times))
+
+    print(f"{'total':<32}" + "".join(f" {t * 1e3:>10.2f}" for t in totals[:len(times)]))
+
+async def benchmark_memory(args):
+    const, common, parser = load(args.root)
+    entries = []
+
+    print(f"{'entries':>8} {'traced MiB':>12} {'RSS MiB':>10}")
+
+    tracemalloc.start()
+    traced, resident = tracemalloc.get_traced_memory()[0], rss()
+
+    # Every entry is an own parser of the same profile w/ the same parameters as for the same inverters on a single instance
+    for n in range(1, args.entries + 1):
+        entries.append(await parser.ParameterParser().init(definitions(const), args.profile, parameters(const)))
+        print(f"{n:>8} {(tracemalloc.get_traced_memory()[0] - traced) / 2 ** 20:>12.2f} {(rss() - resident) / 2 ** 20:>10.2f}")
+
+    tracemalloc.stop()
+
+def stream(pysolarman, tcp, rtu, transport, count, rng):
+    frames, request = [], rtu.read_holding_registers(1, 0, 125)
+    for n in range(count):
+        data = rng.randbytes(2 * rng.randrange(1, 126))
+        match transport:
+            case "tcp":
+                # Responses w/ heartbeats of the logger in between
+                payload = rng.randbytes(14) + bytes([1, 3, len(data)]) + data + rng.randbytes(2) if n % 4 else rng.randbytes(1)
+                frame = pysolarman.PROTOCOL.START + len(payload).to_bytes(2, "little") + bytes([0x10, 0x15 if n % 4 else 0x47]) + rng.randbytes(6) + payload
+                frames.append(frame + bytes([sum(frame[1:]) & 0xFF]) + pysolarman.PROTOCOL.END)
+            case "modbus_tcp":
+                frames.append(rng.randbytes(2) + bytes(2) + (len(data) + 3).to_bytes(2, "big") + bytes([1, 3, len(data)]) + data)
+            case _:
+                # Responses to the same request and exceptions
+                frames.append(bytes([1, 3, 250]) + rng.randbytes(252) if n % 5 else bytes([1, 0x83, 2]) + rng.randbytes(2))
+    return frames, request
+
+def reads(frames, rng, mode):
+    match mode:
+        case "aligned":
+            return frames
+        case "segmented":
+            chunks = []
+            for f in frames:
+                cuts = [0, *sorted(rng.sample(range(1, len(f)), min(3, len(f) - 1))), len(f)]
+                chunks.extend(f[i:j] for i, j in zip(cuts, cuts[1:]))
+            return chunks
+        case _:
+            data, chunks = b"".join(frames), []
+            while data:
+                chunks.append(data[:(n := rng.randrange(1, 1025))])
+                data = data[n:]
+            return chunks
+
+async def benchmark_framer(args):
+    pysolarman, tcp, rtu = load_pysolarman(args.root)
+    modes = ["aligned", "segmented", "coalesced"]
+
+    print(f"{'transport':<12}" + "".join(f" {m + ' frames/s':>20}" for m in modes))
+
+    for transport in ["tcp", "modbus_tcp", "modbus_rtu"]:
+        rng, rates = random.Random(transport), []
+        frames, request = stream(pysolarman, tcp, rtu, transport, args.frames, rng)
+
+        for mode in modes:
+            chunks = reads(frames, rng, mode)
+            client = pysolarman.Solarman("127.0.0.1", 8899, transport, 0, 1, 5)
+            client._expected = pysolarman.expected_response_pdu_size_from_request_pdu(request[1:-2]) + 3
+
+            # Reassembly of the read sequences is verified by tests/test_framer.py
+            start = time.perf_counter()
+            for c in chunks:
+                for _ in client._frames(c):
+                    pass
+            rates.append(len(frames) / (time.perf_counter() - start))
+
+        print(f"{transport:<12}" + "".join(f" {r:>20,.0f}" for r in rates))
+
+def v5_response(pysolarman, rtu, serial, seq, count, rng):
+    data = bytes([1, 3, count * 2]) + rng.randbytes(count * 2)
+    payload = b"\x02" + bytes(13) + data + rtu.get_crc(data)
+    frame = b"\xa5" + len(payload).to_bytes(2, "little") + bytes([0x10, 0x15, seq, 0]) + serial.to_bytes(4, "little") + payload
+    return frame + bytes([sum(frame[1:]) & 0xFF]) + pysolarman.PROTOCOL.END
+
+async def benchmark_codec(args):
+    pysolarman, tcp, rtu = load_pysolarman(args.root)
+    client, rng = pysolarman.Solarman("127.0.0.1", 8899, "tcp", 3012345678, 1, 5), random.Random(0)
+    coded = hasattr(client, "_encode_request") # Checkouts w/o the codec are measured only through the request
+
+    print(f"{'registers':>10} {'encode frames/s':>16} {'decode frames/s':>16} {'request frames/s':>17}")
+
+    for count in (1, 10, 60, 125):
+        request = rtu.read_holding_registers(1, 0, count)
+        responses = [v5_response(pysolarman, rtu, client.serial, seq, count, rng) for seq in range(256)]
+        rates = []
+
+        if coded:
+            rates.append(1 / measure(lambda: client._encode_request(request), args.frames))
+            client._sequence_number, frame = responses[0][5], responses[0]
+            rates.append(1 / measure(lambda: client._decode_response(frame, request), args.frames))
+
+        # Whole request w/ the transport replaced by the prepared responses
+        async def send_receive(frame):
+            return responses[frame[5]]
+
+        client._send_receive_frame = send_receive
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            await client._parse_adu_from_sol_response(3, 0, count = count)
+        rates.append(args.frames / (time.perf_counter() - start))
+
+        cells = [f"{r:>16,.0f}" for r in rates[:-1]] if coded else [f"{'-':>16}"] * 2
+        print(f"{count:>10} " + " ".join(cells) + f" {rates[-1]:>17,.0f}")
+
+def crc_reference(table, msg):
+    # Per byte CRC of the original umodbus implementation
+    register = 0xFFFF
+    for byte_ in msg:
+        try:
+            val = struct.unpack('<B', byte_)[0]
+        except TypeError:
+            val = byte_
+        register = (register >> 8) ^ table[(register ^ val) & 0xFF]
+    return struct.pack('<H', register)
+
+async def benchmark_crc(args):
+    sys.path.insert(0, args.root)
+    from custom_components.solarman.pysolarman.umodbus.client.serial import redundancy_check
+    rng, table = random.Random(0), redundancy_check.look_up_table
+
+    # Equivalence w/ the reference is verified by tests/test_crc.py
+    print(f"crcmod: {'yes' if getattr(redundancy_check, '_crc16', None) is not None else 'no'}")
+    print(f"{'bytes':>6} {'reference µs':>14} {'get_crc µs':>12} {'speedup':>8}")
+
+    for size in (8, 64, 128, 256):
+        m = rng.randbytes(size)
+        reference, current = measure(lambda: crc_reference(table, m), args.polls), measure(lambda: redundancy_check.get_crc(m), args.polls)
+        print(f"{size:>6} {reference * 1e6:>14.2f} {current * 1e6:>12.2f} {reference / current:>8.1f}")
+
+async def modbus_server(latency: float):
+    # Stand-in Modbus TCP logger answering one request at a time after the latency
+    async def handle(reader, writer):
+        try:
+            while request := await reader.readexactly(12):
+                await asyncio.sleep(latency)
+                count = int.from_bytes(request[10:12], "big")
+                writer.write(request[:4] + (count * 2 + 3).to_bytes(2, "big") + request[6:8] + bytes([count * 2]) + bytes(count * 2))
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            pass
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+async def benchmark_pacing(args):
+    pysolarman, tcp, rtu = load_pysolarman(args.root)
+    base = None
+
+    print(f"{'endpoints':>10} {'requests/s':>12} {'per endpoint':>14} {'scaling':>8}")
+
+    for endpoints in (1, 2, 4, 8, 16):
+        servers = [await modbus_server(args.latency / 1000) for _ in range(endpoints)]
+        clients = [pysolarman.Solarman("127.0.0.1", s.sockets[0].getsockname()[1], "modbus_tcp", 0, 1, 5) for s in servers]
+
+        async def poll(client):
+            for _ in range(args.requests):
+                await client.execute(3, 0, count = 10)
+
+        # Every endpoint is polled concurrently as by the coordinators of the entries
+        start = time.perf_counter()
+        await asyncio.gather(*(poll(c) for c in clients))
+        rate = endpoints * args.requests / (time.perf_counter() - start)
+        base = base or rate
+
+        print(f"{endpoints:>10} {rate:>12.1f} {rate / endpoints:>14.1f} {rate / base:>8.2f}")
+
+        for c in clients:
+            await c.close()
+        for s in servers:
+            s.close()
+
+async def v5_server(pysolarman, rtu, latency: float, loss: float, rng: random.Random, connections: list | None = None):
+    # Stand-in logger answering V5 requests over both TCP and UDP after the latency, requests are lost w/ the probability of loss
+    # W/ the list of connections, the logger has a single client slot and a new connection drops the previous one
+    def respond(request: bytes):
+        return v5_response(pysolarman, rtu, int.from_bytes(request[7:11], "little"), request[5], int.from_bytes(request[30:32], "big"), rng) if request[4] == 0x45 and rng.random() >= loss else None
+
+    async def handle(reader, writer):
+        if connections is not None:
+            if connections:
+                connections[-1].close()
+            connections.append(writer)
+        try:
+            while header := await reader.readexactly(3):
+                request = header + await reader.readexactly(int.from_bytes(header[1:3], "little") + 10)
+                if (response := respond(request)) is not None:
+                    await asyncio.sleep(latency)
+                    writer.write(response)
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    class Datagrams(asyncio.DatagramProtocol):
+        def connection_made(self, transport):
+            self.transport = transport
+
+        def datagram_received(self, data, addr):
+            if (response := respond(data)) is not None:
+                asyncio.get_running_loop().call_later(latency, self.transport.sendto, response, addr)
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    datagrams, _ = await asyncio.get_running_loop().create_datagram_endpoint(Datagrams, local_addr = ("127.0.0.1", server.sockets[0].getsockname()[1]))
+    return server, datagrams
+
+async def benchmark_transports(args):
+    pysolarman, tcp, rtu = load_pysolarman(args.root)
+    server, datagrams = await v5_server(pysolarman, rtu, args.latency / 1000, args.loss / 100, random.Random(0))
+    port = server.sockets[0].getsockname()[1]
+
+    print(f"{'transport':<10} {'first ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'requests/s':>11} {'retransmits':>12}")
+
+    # Checkouts w/o the datagram transport are measured only over TCP
+    for transport in ("tcp", "udp") if hasattr(pysolarman, "DatagramStream") else ("tcp",):
+        client, times = pysolarman.Solarman("127.0.0.1", port, transport, 3012345678, 1, 5), []
+
+        # The first request includes the connection setup
+        for _ in range(args.requests + 1):
+            start = time.perf_counter()
+            await client.execute(3, 0, count = 10)
+            times.append((time.perf_counter() - start) * 1000)
+
+        first, times = times[0], sorted(times[1:])
+        retransmits = client.statistics["retransmits"] if hasattr(client, "statistics") else "-"
+        print(f"{transport:<10} {first:>9.2f} {times[len(times) // 2]:>8.2f} {times[len(times) * 95 // 100]:>8.2f} {times[-1]:>8.2f} {len(times) * 1000 / sum(times):>11.1f} {retransmits:>12}")
+
+        await client.close()
+
+    datagrams.close()
+    server.close()
+
+async def benchmark_sharing(args):
+    pysolarman, tcp, rtu = load_pysolarman(args.root)
+
+    print(f"{'connections':<12} {'entries':>8} {'seconds':>8} {'requests/s':>11} {'failures':>9} {'connects':>9}")
+
+    # Checkouts w/o the connection sharing are measured only w/ a connection per entry
+    for mode in ("separate", "shared") if hasattr(pysolarman.Solarman, "share") else ("separate",):
+        server, datagrams = await v5_server(pysolarman, rtu, args.latency / 1000, 0, random.Random(0), connections := [])
+        port = server.sockets[0].getsockname()[1]
+        clients = [pysolarman.Solarman.share("127.0.0.1", port, "tcp", 3012345678, slave, 5) if mode == "shared" else pysolarman.Solarman("127.0.0.1", port, "tcp", 3012345678, slave, 5) for slave in range(1, args.entries + 1)]
+        failures = 0
+
+        async def poll(client):
+            nonlocal failures
+            for _ in range(args.requests):
+                try:
+                    await client.execute(3, 0, count = 10)
+                except Exception:
+                    failures += 1
+
+        # Every entry is polled concurrently as by the coordinators of the entries
+        start = time.perf_counter()
+        await asyncio.gather(*(poll(c) for c in clients))
+        elapsed = time.perf_counter() - start
+
+        print(f"{mode:<12} {args.entries:>8} {elapsed:>8.2f} {(args.entries * args.requests - failures) / elapsed:>11.1f} {failures:>9} {len(connections):>9}")
+
+        for c in clients:
+            await (c.release() if mode == "shared" else c.close())
+        datagrams.close()
+        server.close()
+
+IMPORT_SCRIPT = """
+import os, sys, types
+sys.path.insert(0, {root!r})
+# Package modules w/o their __init__, Home Assistant is already loaded on startup
+for name, path in (("custom_components", "custom_components"), ("custom_components.solarman", "custom_components/solarman")):
+    sys.modules[name] = types.ModuleType(name)
+    sys.modules[name].__path__ = [os.path.join({root!r}, path)]
+import custom_components.solarman.common
+print("import time: -", file = sys.stderr, flush = True)
+import {module}
+"""
+
+def import_time(root: str, module: str):
+    if (process := subprocess.run([sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT.format(root = root, module = module)], capture_output = True, text = True)).returncode:
+        return None
+    lines = (process := process.stderr.splitlines())[process.index("import time: -") + 1:]
+    modules = [(int(cumulative), name) for _, cumulative, name in (l.removeprefix("import time:").split("|") for l in lines if l.startswith("import time:"))]
+    return sum(c for c, n in modules if not n.startswith("   ")), [n.strip() for c, n in modules if c >= 1000 and not n.strip().startswith("custom_components")]
+
+async def benchmark_imports(args):
+    modules = ["custom_components.solarman.pysolarman", "custom_components.solarman.parser", "custom_components.solarman.planner"]
+
+    print(f"{'module':<40} {'ms':>8}  dependencies over 1 ms")
+
+    for module in modules:
+        # Best of fresh interpreters w/ warm bytecode caches as on every restart of Home Assistant
+        if None in (results := [import_time(args.root, module) for _ in range(args.runs)]):
+            print(f"{module.removeprefix('custom_components.solarman.'):<40} {'-':>8}  not available")
+            continue
+        times, dependencies = zip(*results)
+        print(f"{module.removeprefix('custom_components.solarman.'):<40} {min(times) / 1000:>8.2f}  {', '.join(dependencies[0]) or '-'}")
+
+async def benchmark_planner(args):
+    const, common, parser = load(args.root)
+    planner = load_planner(args.root)
+    planners = [const.REQUEST_PLANNER_GREEDY, const.REQUEST_PLANNER_OPTIMAL]
+    totals = [[0, 0, 0] for _ in planners]
+
+    print(f"{'profile':<32}" + "".join(f" {f'{p} req':>12} {f'{p} reg':>12} {f'{p} ms':>12}" for p in planners))
+
+    for f in profiles(const):
+        rows = []
+
+        for n, name in enumerate(planners):
+            p = await parser.ParameterParser().init(definitions(const), f, parameters(const))
+            p._planner = name
+            p.compile()
+
+            # Round trips, registers and expected poll time w/ the profile's cost model averaged over the ticks
+            requests = [p.schedule_requests(runtime) for runtime in range(0, args.ticks * const.TIMINGS_INTERVAL, const.TIMINGS_INTERVAL)]
+            rows.append(row := (sum(len(r) for r in requests) / args.ticks, sum(r[const.REQUEST_COUNT] for rs in requests for r in rs) / args.ticks, sum(planner.plan_cost(r, p._latency, p._cost) for r in requests) / args.ticks))
+            totals[n] = [t + v for t, v in zip(totals[n], row)]
+
+        print(f"{f:<32}" + "".join(f" {req:>12.2f} {reg:>12.1f} {ms:>12.1f}" for req, reg, ms in rows))
+
+    print(f"{'total':<32}" + "".join(f" {req:>12.2f} {reg:>12.1f} {ms:>12.1f}" for req, reg, ms in totals))
+
+if __name__ == '__main__':
+    common = ArgumentParser(add_help = False)
+    common.add_argument("--root", default = ROOT, required = False, type = str, help = "Repository root to benchmark")
+    parser = ArgumentParser("solarman-benchmark", description = "Benchmarks for Solarman integration")
+    subparsers = parser.add_subparsers(dest = "benchmark", required = True)
+    p = subparsers.add_parser("parser", parents = [common], help = "Per-poll decode time of ParameterParser.process for every profile")
+    p.add_argument("--polls", default = 1000, required = False, type = int, help = "Number of polls per profile")
+    p = subparsers.add_parser("ticks", parents = [common], help = "Per-tick scheduling and decode time over a sequence of coordinator ticks for every profile")
+    p.add_argument("--ticks", default = 720, required = False, type = int, help = "Number of ticks (one hour by default)")
+    p = subparsers.add_parser("profiles", parents = [common], help = "Cold (YAML) and warm (cached) setup time of ParameterParser.init for every profile")
+    p.add_argument("--setups", default = 10, required = False, type = int, help = "Number of setups per profile")
+    p = subparsers.add_parser("memory", parents = [common], help = "Memory of parsers for a number of entries using the same profile")
+    p.add_argument("--entries", default = 8, required = False, type = int, help = "Number of entries")
+    p.add_argument("--profile", default = "deye_p3.yaml", required = False, type = str, help = "Profile of the entries")
+    p = subparsers.add_parser("planner", parents = [common], help = "Report round trips, registers and expected time per poll of the greedy and optimal request planners for every profile")
+    p.add_argument("--ticks", default = 720, required = False, type = int, help = "Number of ticks (one hour by default)")
+    p = subparsers.add_parser("framer", parents = [common], help = "Measure the reassembly of aligned, segmented and coalesced frames for every transport")
+    p.add_argument("--frames", default = 10000, required = False, type = int, help = "Number of frames per transport")
+    p = subparsers.add_parser("pacing", parents = [common], help = "Aggregate request throughput of concurrently polled endpoints (stand-in Modbus TCP loggers)")
+    p.add_argument("--requests", default = 20, required = False, type = int, help = "Number of requests per endpoint")
+    p.add_argument("--latency", default = 10, required = False, type = float, help = "Response latency of the loggers in ms")
+    p = subparsers.add_parser("codec", parents = [common], help = "Encode, decode and whole request throughput of the V5 frame codec")
+    p.add_argument("--frames", default = 20000, required = False, type = int, help = "Number of frames per size")
+    p = subparsers.add_parser("crc", parents = [common], help = "Compare the speed of get_crc and the per byte reference")
+    p.add_argument("--polls", default = 10000, required = False, type = int, help = "Number of CRCs per size")
+    p = subparsers.add_parser("imports", parents = [common], help = "Import time (python -X importtime) of the modules of the integration on top of Home Assistant")
+    p.add_argument("--runs", default = 10, required = False, type = int, help = "Number of interpreters per module")
+    p = subparsers.add_parser("transports", parents = [common], help = "Request latency of the V5 protocol over TCP and UDP (stand-in logger)")
+    p.add_argument("--requests", default = 200, required = False, type = int, help = "Number of requests per transport")
+    p.add_argument("--latency", default = 5, required = False, type = float, help = "Response latency of the logger in ms")
+    p.add_argument("--loss", default = 0, required = False, type = float, help = "Lost requests in %%")
+    p = subparsers.add_parser("sharing", parents = [common], help = "Concurrent polls of entries using the same logger w/ a single client slot (stand-in logger)")
+    p.add_argument("--entries", default = 2, required = False, type = int, help = "Number of entries (slaves) using the logger")
+    p.add_argument("--requests", default = 20, required = False, type = int, help = "Number of requests per entry")
+    p.add_argument("--latency", default = 10, required = False, type = float, help = "Response latency of the logger in ms")
+    args = parser.parse_args()
+    asyncio.run(globals()[f"benchmark_{args.benchmark}"](args))